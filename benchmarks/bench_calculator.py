@@ -0,0 +1,33 @@
+"""Compare the Calculator's compiled expression engine with the old eval() path.
+
+Usage: python benchmarks/bench_calculator.py [repeats]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox_core import calc
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'terms':>6} {'eval':>10} {'first':>10} {'cached':>10} {'speedup':>8}   (us per evaluation)")
+    for terms in (10, 100, 500):
+        expression = "+".join(f"({i}.5*{i % 7 + 1}-{i}%3)" for i in range(terms))
+        assert abs(eval(expression) - calc.evaluate_expression(expression)) < 1e-6
+        eval_us = timeit.timeit(lambda: eval(expression), number=repeats) / repeats * 1e6
+
+        def first():
+            calc.compile_expression.cache_clear()
+            calc.evaluate_expression(expression)
+
+        first_us = timeit.timeit(first, number=repeats) / repeats * 1e6
+        calc.evaluate_expression(expression)
+        cached_us = timeit.timeit(lambda: calc.evaluate_expression(expression), number=repeats) / repeats * 1e6
+        print(f"{terms:>6} {eval_us:>10.1f} {first_us:>10.1f} {cached_us:>10.1f} {eval_us / cached_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Headless benchmark suite for startup and every tool's hot path.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--only GROUP,...] [--output FILE]
+        [--baseline FILE] [--tolerance 0.25] [--save-baseline]
+        [--notepad-sizes 1M,100M,1G]
+
+Groups: startup, units, currency, passwords, qr, calculator, notepad.
+
+Results are written as JSON (default benchmarks/results.json). When a
+baseline exists (default benchmarks/baseline.json) every metric present in
+both is compared, and the run exits with status 1 if any metric is worse
+than the baseline by more than the tolerance. --save-baseline stores this
+run as the new baseline instead. Baselines are machine-specific, so record
+one on the machine that will run the comparison.
+
+The startup group needs a display; on Linux without one it runs under
+xvfb-run when that is installed and is skipped otherwise.
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GROUPS = ("startup", "units", "currency", "passwords", "qr", "calculator", "notepad")
+
+
+def metric(value, unit, better):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def best_time(fn, repeats=5, warmup=True):
+    """Median wall time of `fn()` in seconds over `repeats` runs."""
+    if warmup:
+        fn()  # first-use imports and caches
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def parse_size(text):
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+
+# ---------------------- STARTUP ---------------------- #
+# Runs in a fresh interpreter with an empty HOME so no saved alarms, rates or
+# journal recovery prompts get in the way.
+STARTUP_CHILD = r"""
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import toolbox
+app = toolbox.ToolboxApp()
+app.update()
+for tab in app.notebook.tabs():
+    app.notebook.select(tab)
+    app.update()
+print(json.dumps(app.startup_timings))
+app.destroy()
+"""
+
+
+def bench_startup(results, args):
+    command = [sys.executable, "-c", STARTUP_CHILD, ROOT]
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        if not shutil.which("xvfb-run"):
+            print("  startup: skipped (no DISPLAY and xvfb-run is not installed)")
+            return
+        command = ["xvfb-run", "-a"] + command
+    runs = []
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+        for _ in range(args.startup_runs):
+            start = time.perf_counter()
+            output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+            wall = time.perf_counter() - start
+            runs.append((wall, json.loads(output.strip().splitlines()[-1])))
+    results["startup.process_ms"] = metric(statistics.median(w for w, _ in runs) * 1000, "ms", "lower")
+    for key in runs[0][1]:
+        value = statistics.median(timings[key] for _, timings in runs) * 1000
+        results[f"startup.{key.replace(':', '.').replace(' ', '_').lower()}_ms"] = metric(value, "ms", "lower")
+
+
+# ---------------------- TOOLS ---------------------- #
+def bench_units(results, args):
+    from toolbox_core.convert import convert_many, convert_unit
+
+    count = 200000
+    seconds = best_time(lambda: [convert_unit(1.5, "Miles", "Kilometers") for _ in range(count)], 3)
+    results["units.convert_unit_per_s"] = metric(count / seconds, "ops/s", "higher")
+    values = [random.random() * 100 for _ in range(1000000)]
+    seconds = best_time(lambda: convert_many(values, "Fahrenheit", "Celsius"), 3)
+    results["units.convert_many_per_s"] = metric(len(values) / seconds, "values/s", "higher")
+
+
+def bench_currency(results, args):
+    from toolbox_core.currency import (ExchangeRateCache, HistoricalRateStore, convert_currency_stream,
+                                       convert_history_stream)
+
+    rng = random.Random(1)
+    codes = ["USD"] + [f"C{i:02d}" for i in range(169)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ExchangeRateCache(snapshot_path=os.path.join(tmp, "rates.json"), ttl=float("inf"))
+        cache.rates = {code: rng.uniform(0.1, 100) for code in codes}
+        cache.fetched_at = time.time()
+        seconds = best_time(lambda: cache.cross_rates(codes))
+        results["currency.cross_rates_per_s"] = metric(len(codes) ** 2 / seconds, "pairs/s", "higher")
+
+        rows = 200000
+        lines = ["amount,from,to"] + [f"{rng.uniform(1, 1000):.2f},{rng.choice(codes)},{rng.choice(codes)}" for _ in range(rows)]
+        text = "\n".join(lines) + "\n"
+        seconds = best_time(lambda: convert_currency_stream(io.StringIO(text), io.StringIO(), cache.rates), 3)
+        results["currency.csv_rows_per_s"] = metric(rows / seconds, "rows/s", "higher")
+
+        # Historical conversion: a year of daily rates for every currency.
+        store = HistoricalRateStore(os.path.join(tmp, "history.sqlite3"))
+        first = datetime.date(2023, 1, 1).toordinal()
+        days = [datetime.date.fromordinal(first + i).isoformat() for i in range(365)]
+        seconds = best_time(lambda: store.import_records(
+            (day, code, rng.uniform(0.1, 100)) for day in days for code in codes[1:]), 1, False)
+        results["currency.history_import_per_s"] = metric(len(days) * (len(codes) - 1) / seconds, "rates/s", "higher")
+        lines = ["date,amount,from,to"] + [f"{rng.choice(days)},{rng.uniform(1, 1000):.2f},{rng.choice(codes)},{rng.choice(codes)}"
+                                           for _ in range(rows)]
+        text = "\n".join(lines) + "\n"
+        seconds = best_time(lambda: convert_history_stream(io.StringIO(text), io.StringIO(), store), 3)
+        results["currency.history_rows_per_s"] = metric(rows / seconds, "rows/s", "higher")
+        store.close()
+
+
+def bench_passwords(results, args):
+    from toolbox_core.password import write_passwords
+
+    count = 200000
+    seconds = best_time(lambda: write_passwords(io.StringIO(), count, 16, ("upper", "lower", "digits", "symbols")), 3)
+    results["passwords.per_s"] = metric(count / seconds, "passwords/s", "higher")
+
+
+def bench_qr(results, args):
+    from toolbox_core.qr import qr_matrix_image, render_qr_matrix
+
+    for size in (16, 128, 512, 2048):
+        payload = "x" * size
+
+        def render():
+            qr_matrix_image(render_qr_matrix(payload, "L"), 10)
+
+        results[f"qr.render_{size}b_ms"] = metric(best_time(render) * 1000, "ms", "lower")
+
+
+def bench_calculator(results, args):
+    from toolbox_core.calc import compile_expression, evaluate_csv_stream, evaluate_expression
+
+    for terms in (10, 100):
+        expression = "+".join(f"({i}.5*{i % 7 + 1}-{i}%3)" for i in range(terms))
+
+        def first():
+            compile_expression.cache_clear()
+            evaluate_expression(expression)
+
+        results[f"calculator.first_{terms}_terms_us"] = metric(best_time(first, 20) * 1e6, "us", "lower")
+        evaluate_expression(expression)
+        repeats = 10000
+        seconds = best_time(lambda: [evaluate_expression(expression) for _ in range(repeats)], 3)
+        results[f"calculator.cached_{terms}_terms_us"] = metric(seconds / repeats * 1e6, "us", "lower")
+
+    rows = 200000
+    rng = random.Random(1)
+    text = "price,qty,name\n" + "".join(f"{rng.uniform(1, 100):.2f},{rng.randint(1, 20)},item{i}\n" for i in range(rows))
+    seconds = best_time(lambda: evaluate_csv_stream(io.StringIO(text), io.StringIO(), "price * qty * 1.2"), 3)
+    results["calculator.table_rows_per_s"] = metric(rows / seconds, "rows/s", "higher")
+
+
+def _write_sample(path, size):
+    line = "The quick brown fox jumps over the lazy dog 0123456789 " * 2 + "\n"
+    block = line * ((1 << 20) // len(line) + 1)
+    with open(path, "w", encoding="utf-8") as file:
+        written = 0
+        while written < size:
+            chunk = block[:size - written]
+            file.write(chunk)
+            written += len(chunk)
+
+
+def bench_notepad(results, args):
+    # Mirrors the Notepad's own paths: files under LARGE_FILE_THRESHOLD are
+    # read whole, larger ones are opened as an indexed LargeFileView; saving
+    # goes through EditJournal.compact like the Save button.
+    from toolbox_core.notepad import LARGE_FILE_THRESHOLD, EditJournal, LargeFileView
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = EditJournal(os.path.join(tmp, "notepad.journal"))
+        for text in args.notepad_sizes.split(","):
+            size = parse_size(text)
+            path = os.path.join(tmp, "sample.txt")
+            _write_sample(path, size)
+            repeats = 3 if size < (256 << 20) else 1
+            warmup = size < (256 << 20)
+
+            def open_file():
+                if size >= LARGE_FILE_THRESHOLD:
+                    view = LargeFileView(path)
+                    while not view.complete:
+                        time.sleep(0.001)
+                    view.read_lines(0, 100)
+                    view.close()
+                else:
+                    with open(path, "r", encoding="utf-8") as file:
+                        file.read()
+
+            results[f"notepad.open_{text.strip().lower()}_ms"] = metric(best_time(open_file, repeats, warmup) * 1000, "ms", "lower")
+
+            def save_file():
+                journal.reset(path)
+                journal.compact([["i", "1.0", "x"]])
+
+            results[f"notepad.save_{text.strip().lower()}_ms"] = metric(best_time(save_file, repeats, warmup) * 1000, "ms", "lower")
+            os.remove(path)
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "units": bench_units,
+    "currency": bench_currency,
+    "passwords": bench_passwords,
+    "qr": bench_qr,
+    "calculator": bench_calculator,
+    "notepad": bench_notepad,
+}
+
+
+# ---------------------- BASELINE ---------------------- #
+def compare(results, baseline, tolerance):
+    """Print each metric against the baseline and return the regressed names."""
+    regressions = []
+    print(f"\n{'metric':<40}{'baseline':>14}{'current':>14}{'change':>9}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            print(f"{name:<40}{'-':>14}{current['value']:>14.4g}")
+            continue
+        change = current["value"] / base["value"] - 1
+        worse = change > tolerance if current["better"] == "lower" else change < -tolerance
+        if worse:
+            regressions.append(name)
+        print(f"{name:<40}{base['value']:>14.4g}{current['value']:>14.4g}{change:>+8.1%}{'  REGRESSION' if worse else ''}")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Toolbox benchmark suite.")
+    parser.add_argument("--only", default=",".join(GROUPS), help="comma-separated groups to run")
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"))
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"))
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--notepad-sizes", default="1M,100M,1G")
+    parser.add_argument("--startup-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    groups = [group.strip() for group in args.only.split(",") if group.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for group in groups:
+        print(f"running {group}...", flush=True)
+        BENCHMARKS[group](results, args)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against (use --save-baseline)")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
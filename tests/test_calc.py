@@ -0,0 +1,23 @@
+"""Table-mode namespace and CSV column naming."""
+import pytest
+
+from toolbox_core.calc import CALC_NAMESPACE, _table_globals, column_variable
+
+
+def test_table_namespace_matches_scalar_namespace():
+    pytest.importorskip("numpy")
+    names = _table_globals().keys() - {"__builtins__", "_pow"}
+    assert names == CALC_NAMESPACE.keys()
+
+
+@pytest.mark.parametrize("header, name", [
+    ("Unit Price", "Unit_Price"),
+    ("2024", "c_2024"),
+    ("", "c_"),
+    ("#qty", "c__qty"),
+    ("_pow", "c__pow"),
+    ("from", "c_from"),
+    ("lambda", "c_lambda"),
+])
+def test_column_variable(header, name):
+    assert column_variable(header) == name
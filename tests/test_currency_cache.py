@@ -0,0 +1,94 @@
+"""ExchangeRateCache against a local stand-in for the rate service."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from toolbox_core.currency import ExchangeRateCache
+
+pytest.importorskip("requests")
+
+
+class RateService(BaseHTTPRequestHandler):
+    rates = {"EUR": 0.9, "GBP": 0.8}
+    failing = False
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.failing:
+            self.send_error(503)
+            return
+        body = json.dumps({"success": True, "rates": self.rates}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def service():
+    handler = type("Service", (RateService,), {})
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield handler, f"http://127.0.0.1:{server.server_port}/latest"
+    server.shutdown()
+    server.server_close()
+
+
+def make_cache(url, snapshot_path, ttl=3600):
+    cache = ExchangeRateCache(ttl=ttl, snapshot_path=str(snapshot_path), url=url, timeout=5)
+    cache.session.trust_env = False  # never route the local service through a proxy
+    return cache
+
+
+def test_network_then_cache_then_snapshot(service, tmp_path):
+    handler, url = service
+    snapshot = tmp_path / "rates.json"
+    cache = make_cache(url, snapshot)
+    assert cache.source is None
+
+    assert cache.get_rates() == {"EUR": 0.9, "GBP": 0.8, "USD": 1.0}
+    assert cache.source == "network"
+    assert snapshot.exists()
+
+    assert cache.convert(10, "USD", "EUR") == pytest.approx(9.0)
+    assert cache.source == "cache"
+    assert handler.hits == 1
+
+    handler.failing = True
+    assert cache.get_rates(force=True)["GBP"] == 0.8
+    assert cache.source == "snapshot"
+    assert handler.hits == 2
+
+    # A restart with the service still down serves the saved snapshot.
+    offline = make_cache(url, snapshot, ttl=0)
+    assert offline.source == "snapshot"
+    assert offline.rate("EUR", "GBP") == pytest.approx(0.8 / 0.9)
+    assert offline.source == "snapshot"
+
+
+def test_failed_fetch_without_snapshot_raises(service, tmp_path):
+    handler, url = service
+    handler.failing = True
+    cache = make_cache(url, tmp_path / "rates.json")
+    with pytest.raises(Exception):
+        cache.get_rates()
+
+
+def test_concurrent_stale_callers_share_one_fetch(service, tmp_path):
+    handler, url = service
+    cache = make_cache(url, tmp_path / "rates.json")
+    threads = [threading.Thread(target=cache.get_rates) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert handler.hits == 1
+    assert cache.rates["USD"] == 1.0
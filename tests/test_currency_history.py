@@ -0,0 +1,78 @@
+"""HistoricalRateStore and dated conversion, offline against fixture dumps."""
+import csv
+import io
+import os
+
+import pytest
+
+from toolbox_core.currency import HistoricalRateStore, convert_history_stream
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoricalRateStore(str(tmp_path / "history.sqlite3"))
+    for name in ("rates_wide.csv", "rates_long.csv", "rates.json"):
+        store.import_file(os.path.join(FIXTURES, name))
+    yield store
+    store.close()
+
+
+def test_import_file_reads_wide_long_and_json_dumps(tmp_path):
+    store = HistoricalRateStore(str(tmp_path / "history.sqlite3"))
+    assert store.import_file(os.path.join(FIXTURES, "rates_wide.csv")) == 5  # the empty GBP cell is skipped
+    assert store.import_file(os.path.join(FIXTURES, "rates_long.csv")) == 2
+    assert store.import_file(os.path.join(FIXTURES, "rates.json")) == 3
+    assert store.currencies() == ["CHF", "EUR", "GBP", "JPY"]
+    assert store.date_range() == ("2024-01-02", "2024-01-10")
+    assert len(store) == 10
+    # Re-importing replaces rates rather than duplicating them.
+    store.import_file(os.path.join(FIXTURES, "rates_wide.csv"))
+    assert len(store) == 10
+    store.close()
+
+
+def test_import_rejects_a_dump_with_another_base(tmp_path):
+    store = HistoricalRateStore(str(tmp_path / "history.sqlite3"), base="EUR")
+    with pytest.raises(ValueError):
+        store.import_file(os.path.join(FIXTURES, "rates.json"))
+    store.close()
+
+
+def test_rate_uses_the_latest_rate_on_or_before_the_date(store):
+    assert store.rate_on("EUR", "2024-01-02") == ("2024-01-02", 0.91)
+    assert store.rate_on("EUR", "2024-01-07") == ("2024-01-05", 0.92)
+    assert store.rate_on("EUR", "2024-01-09") == ("2024-01-09", 0.915)
+    # GBP has no rate on the 5th, so the 2nd still applies.
+    assert store.rate("EUR", "GBP", "2024-01-06") == pytest.approx(0.79 / 0.92)
+    assert store.rate("USD", "JPY", "2024-01-08") == pytest.approx(145.0)
+    assert store.rate("EUR", "USD", "2030-01-01") == pytest.approx(1 / 0.90)
+
+
+def test_rate_before_the_first_date_is_an_error(store):
+    with pytest.raises(KeyError):
+        store.rate("EUR", "USD", "2024-01-01")
+    with pytest.raises(KeyError):
+        store.rate("USD", "XYZ", "2024-01-05")
+    with pytest.raises(ValueError):
+        store.rate("EUR", "USD", "yesterday")
+
+
+def test_convert_history_stream(store):
+    with open(os.path.join(FIXTURES, "transactions.csv"), newline="", encoding="utf-8") as src:
+        dst = io.StringIO()
+        summary = convert_history_stream(src, dst, store, from_curr="USD", chunk_size=2)
+    rows = list(csv.reader(io.StringIO(dst.getvalue())))
+    assert rows[0] == ["date", "amount", "from", "to", "converted"]
+    converted = [row[-1] for row in rows[1:]]
+    assert converted == [
+        f"{100 / 0.91:.2f}",  # EUR on the 2nd
+        "",  # before the first EUR rate
+        f"{100 * 0.90 / 0.78:.2f}",  # latest GBP and EUR
+        "",  # invalid date
+        f"{1000 * 0.79 / 140.5:.2f}",  # JPY of the 3rd, GBP of the 2nd
+        f"{50 * 0.86:.2f}",  # empty 'from' uses the USD default
+    ]
+    assert summary["rows"] == 6
+    assert summary["skipped"] == 2
@@ -0,0 +1,96 @@
+"""TimerEngine deadline scheduling, driven by a simulated clock."""
+import math
+import random
+
+import pytest
+
+from toolbox_core.timer import TimerEngine
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def run_host(engine, clock, until, jitter, rng):
+    """Mimic the Timer tab: one wakeup for the nearest deadline or the next
+    whole-second label change, each delivered up to `jitter` seconds late.
+
+    Returns {name: seconds late} for every timer that fired, and the number
+    of wakeups.
+    """
+    fired = {}
+    wakeups = 0
+    while clock.now < until:
+        deadline = engine.next_deadline()
+        if deadline is None:
+            break
+        # The label shows whole seconds, so wake when the nearest one ticks over.
+        remaining = deadline - clock.now
+        tick = clock.now + (remaining % 1.0 or 1.0)
+        wake = min(deadline, tick)
+        clock.now = max(clock.now, wake) + rng.uniform(0, jitter)
+        wakeups += 1
+        deadlines = {name: timer.deadline for name, timer in engine.timers.items() if timer.state == "running"}
+        for name in engine.pop_expired():
+            fired[name] = clock.now - deadlines[name]
+    return fired, wakeups
+
+
+def test_hour_long_run_has_no_cumulative_drift():
+    clock = FakeClock()
+    engine = TimerEngine(clock=clock)
+    start = clock.now
+    engine.start("hour", 3600)
+    engine.start("tea", 240)
+    engine.start("half", 1800.5)
+    jitter = 0.020
+
+    fired, wakeups = run_host(engine, clock, start + 4000, jitter, random.Random(12))
+
+    # Thousands of late wakeups happened, yet each timer fires within a
+    # single callback's lateness of its deadline instead of their sum.
+    assert wakeups > 3000
+    assert set(fired) == {"hour", "tea", "half"}
+    for lateness in fired.values():
+        assert 0 <= lateness <= jitter
+    assert engine.remaining("hour") == 0.0
+    assert engine.timers["hour"].state == "done"
+
+
+def test_pause_and_resume_keep_the_remaining_time():
+    clock = FakeClock()
+    engine = TimerEngine(clock=clock)
+    engine.start("t", 60)
+    clock.now += 20.25
+    engine.pause("t")
+    clock.now += 500  # paused time does not count
+    assert engine.remaining("t") == pytest.approx(39.75)
+    assert engine.next_deadline() is None
+    engine.resume("t")
+    assert engine.next_deadline() == pytest.approx(clock.now + 39.75)
+    clock.now += 39.75
+    assert engine.pop_expired() == ["t"]
+
+
+def test_stale_heap_entries_are_skipped():
+    clock = FakeClock()
+    engine = TimerEngine(clock=clock)
+    engine.start("a", 10)
+    engine.start("b", 5)
+    engine.start("a", 30)  # restart leaves the old 10 s entry in the heap
+    engine.remove("b")
+    assert engine.next_deadline() == pytest.approx(clock.now + 30)
+    clock.now += 10
+    assert engine.pop_expired() == []
+    clock.now += 20
+    assert engine.pop_expired() == ["a"]
+    assert math.isclose(engine.remaining("a"), 0.0)
+
+
+def test_non_positive_duration_is_rejected():
+    with pytest.raises(ValueError):
+        TimerEngine().start("t", 0)
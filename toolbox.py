@@ -1,18 +1,505 @@
+import sys
+import time
+
+_PROCESS_START = time.perf_counter()
+
+# `toolbox.py <command> ...` runs the headless CLI without loading tkinter.
+if __name__ == "__main__" and len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+    from toolbox_core.cli import main
+    sys.exit(main())
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
 import tkinter.simpledialog as simpledialog
-import time
-import random
-import string
-import requests
-import qrcode
-from PIL import Image, ImageTk
+import bisect
+import csv
+import math
+import os
+import queue
+import re
+import threading
 import datetime
-import winsound
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from toolbox_core import DATA_DIR, _import_heavy, _import_timings
+from toolbox_core.alarm import ALARM_REPEATS, AlarmStore, play_alarm_sound
+from toolbox_core.calc import column_variable, evaluate_csv_stream, evaluate_expression
+from toolbox_core.convert import UNIT_REGISTRY, convert_unit
+from toolbox_core.currency import ExchangeRateCache, convert_currency_csv
+from toolbox_core.notepad import (LARGE_FILE_THRESHOLD, Document, DocumentCache, EditJournal, LargeFileView,
+                                  compile_search_pattern, find_text_matches)
+from toolbox_core.password import generate_passwords, password_entropy_bits, write_passwords
+from toolbox_core.qr import QR_ERROR_LEVELS, QRMatrixCache, generate_qr_batch, qr_matrix_image, render_qr_matrix
+from toolbox_core.timer import LapStore, TimerEngine, format_elapsed, format_hms
+
+
+# ---------------------- REFRESH SCHEDULER ---------------------- #
+class _RefreshTool:
+    __slots__ = ("callback", "min_interval", "background", "visible", "due", "shown", "calls", "hidden_calls")
+
+    def __init__(self, callback, rate, background, visible):
+        self.callback = callback
+        self.min_interval = 1.0 / rate
+        self.background = background
+        self.visible = visible
+        self.due = None
+        self.shown = False
+        self.calls = 0
+        self.hidden_calls = 0
+
+
+class RefreshScheduler:
+    """One wakeup source shared by every ticking tool.
+
+    A tool registers a callback, a maximum refresh rate in Hz, whether it
+    needs ticks while hidden, and a `visible()` predicate. The callback is
+    called as `callback(visible)` and returns the number of seconds until it
+    next wants to run, or None to go idle until `wake()`. Only the earliest
+    due time holds a pending `after()`, and tools due within COALESCE of each
+    other run in the same wakeup. Hidden tools without background ticks are
+    paused and run again as soon as they become visible.
+    """
+
+    COALESCE = 0.015
+
+    def __init__(self, after, after_cancel, clock=time.monotonic):
+        self._after = after
+        self._after_cancel = after_cancel
+        self.clock = clock
+        self.tools = {}
+        self.wakeups = 0
+        self._job = None
+        self._job_due = None
+
+    def register(self, name, callback, rate, background=False, visible=lambda: True):
+        self.tools[name] = _RefreshTool(callback, rate, background, visible)
+        self.wake(name)
+
+    def unregister(self, name):
+        self.tools.pop(name, None)
+        self._reschedule()
+
+    def wake(self, name):
+        """Run `name` now, e.g. after its state changed, and reschedule."""
+        self._run(self.tools[name])
+        self._reschedule()
+
+    def visibility_changed(self):
+        """Call when the selected tab or the window state changes."""
+        for tool in list(self.tools.values()):
+            visible = tool.visible()
+            if visible and not tool.shown:
+                self._run(tool)
+            elif not visible:
+                tool.shown = False
+                if not tool.background:
+                    tool.due = None
+        self._reschedule()
+
+    def stats(self):
+        return {name: {"calls": tool.calls, "hidden_calls": tool.hidden_calls}
+                for name, tool in self.tools.items()}
+
+    def _run(self, tool):
+        visible = tool.shown = bool(tool.visible())
+        if not visible and not tool.background:
+            tool.due = None
+            return
+        tool.calls += 1
+        if not visible:
+            tool.hidden_calls += 1
+        tool.due = None
+        delay = tool.callback(visible)
+        if delay is not None:
+            if visible:
+                delay = max(delay, tool.min_interval)
+            tool.due = self.clock() + max(0.0, delay)
+
+    def _fire(self):
+        self._job = self._job_due = None
+        self.wakeups += 1
+        horizon = self.clock() + self.COALESCE
+        error = None
+        for tool in list(self.tools.values()):
+            if tool.due is not None and tool.due <= horizon:
+                try:
+                    self._run(tool)
+                except Exception as e:  # keep the other tools ticking
+                    tool.due = None
+                    error = error or e
+        self._reschedule()
+        if error is not None:
+            raise error
+
+    def _reschedule(self):
+        due = min((tool.due for tool in self.tools.values() if tool.due is not None), default=None)
+        if due == self._job_due:
+            return
+        if self._job is not None:
+            self._after_cancel(self._job)
+            self._job = self._job_due = None
+        if due is not None:
+            delay = max(0.0, due - self.clock())
+            self._job = self._after(max(1, math.ceil(delay * 1000)), self._fire)
+            self._job_due = due
+
+
+# ---------------------- CALLBACK PROFILER ---------------------- #
+class _RingStats:
+    """Count, total and max of a series plus its last `size` values for percentiles."""
+
+    __slots__ = ("count", "total", "max", "values", "pos")
+
+    def __init__(self, size):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.values = [0.0] * size
+        self.pos = 0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.values)
+
+    def recent(self):
+        return self.values[:self.count] if self.count < len(self.values) else self.values
+
+    def percentile(self, q):
+        values = sorted(self.recent())
+        return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+class CallbackProfiler:
+    """Wall time of every Tk callback and main-loop lag, kept in ring buffers.
+
+    Commands, event bindings and after() callbacks are timed per callback
+    name. Lag is how late an after() callback fired compared to when it was
+    scheduled to. While `enabled` is False the hooks cost one attribute
+    check per callback and record nothing.
+    """
+
+    HISTOGRAM_BUCKETS_MS = (1, 4, 16, 50, 100, 250)
+
+    def __init__(self, ring_size=512, trace_size=20000):
+        self.enabled = False
+        self.ring_size = ring_size
+        self.origin = time.perf_counter()
+        self.stats = {}
+        self.lag = _RingStats(ring_size)
+        self.trace = deque(maxlen=trace_size)  # (kind, name, start, seconds)
+
+    def reset(self):
+        self.stats.clear()
+        self.lag = _RingStats(self.ring_size)
+        self.trace.clear()
+
+    def record(self, kind, name, start, seconds):
+        stats = self.stats.get((kind, name))
+        if stats is None:
+            stats = self.stats[(kind, name)] = _RingStats(self.ring_size)
+        stats.add(seconds)
+        self.trace.append((kind, name, start, seconds))
+
+    def record_lag(self, name, fired_at, seconds):
+        self.lag.add(seconds)
+        self.trace.append(("lag", name, fired_at, seconds))
+
+    def histogram(self, stats):
+        counts = [0] * (len(self.HISTOGRAM_BUCKETS_MS) + 1)
+        for value in stats.recent():
+            counts[bisect.bisect_left(self.HISTOGRAM_BUCKETS_MS, value * 1000)] += 1
+        return counts
+
+    def summary(self):
+        """Per-callback rows, slowest total first, times in milliseconds."""
+        rows = []
+        for (kind, name), stats in self.stats.items():
+            rows.append({
+                "kind": kind,
+                "name": name,
+                "count": stats.count,
+                "total_ms": stats.total * 1000,
+                "mean_ms": stats.total / stats.count * 1000,
+                "p95_ms": stats.percentile(0.95) * 1000,
+                "max_ms": stats.max * 1000,
+                "histogram": self.histogram(stats),
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def lag_summary(self):
+        return {
+            "count": self.lag.count,
+            "p50_ms": self.lag.percentile(0.5) * 1000,
+            "p95_ms": self.lag.percentile(0.95) * 1000,
+            "max_ms": self.lag.max * 1000,
+        }
+
+    def to_json(self):
+        return {
+            "histogram_buckets_ms": list(self.HISTOGRAM_BUCKETS_MS),
+            "lag": self.lag_summary(),
+            "callbacks": self.summary(),
+        }
+
+    def to_chrome_trace(self):
+        """The recent events in Chrome trace format (chrome://tracing, Perfetto)."""
+        events = []
+        for kind, name, start, seconds in self.trace:
+            ts = (start - self.origin) * 1e6
+            if kind == "lag":
+                events.append({"name": "mainloop lag", "ph": "C", "ts": ts, "pid": 1, "tid": 1,
+                               "args": {"lag_ms": seconds * 1000}})
+            else:
+                events.append({"name": name, "cat": kind, "ph": "X", "ts": ts, "dur": seconds * 1e6,
+                               "pid": 1, "tid": 1})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+PROFILER = CallbackProfiler()
+
+
+def _callback_name(func):
+    func = getattr(func, "func", func)  # functools.partial
+    return getattr(func, "__qualname__", None) or type(func).__name__
+
+
+class _TimedAfter:
+    """An after() callback that reports its lag and run time to PROFILER."""
+
+    __slots__ = ("func", "due")
+
+    def __init__(self, func, delay_ms):
+        self.func = func
+        self.due = time.perf_counter() + (0 if delay_ms == "idle" else delay_ms / 1000)
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        name = _callback_name(self.func)
+        PROFILER.record_lag(name, start, max(0.0, start - self.due))
+        try:
+            return self.func(*args)
+        finally:
+            PROFILER.record("after", name, start, time.perf_counter() - start)
+
+
+_tk_callback = tk.CallWrapper.__call__
+
+
+class _ProfiledCallWrapper(tk.CallWrapper):
+    # Every Python callback Tk invokes (button commands, bindings, scrollbar
+    # commands) goes through CallWrapper. after() callbacks are timed by
+    # _TimedAfter instead, so tkinter's own after trampoline is skipped here.
+    def __call__(self, *args):
+        if not PROFILER.enabled or getattr(self.func, "__qualname__", "") == "Misc.after.<locals>.callit":
+            return _tk_callback(self, *args)
+        start = time.perf_counter()
+        try:
+            return _tk_callback(self, *args)
+        finally:
+            PROFILER.record("event" if self.subst else "command", _callback_name(self.func), start,
+                            time.perf_counter() - start)
+
+
+# Installed before any widget exists, since Tk keeps the wrapper it was
+# registered with.
+tk.CallWrapper = _ProfiledCallWrapper
+
+
+# ---------------------- BACKGROUND TASKS ---------------------- #
+class Task:
+    """Handle for work submitted to a TaskRunner.
+
+    Workers submitted with pass_task=True get the task as their first
+    argument, so they can call `report(...)` to send progress to the UI and
+    poll `cancelled()` to stop early. A thread cannot be interrupted, so
+    cancel() and timeouts only stop the result from being delivered; a
+    worker that never checks `cancelled()` runs to completion unseen.
+    """
+
+    __slots__ = ("group", "deadline", "on_done", "on_error", "on_progress", "on_cancel", "future", "state",
+                 "cancel_event", "_runner")
+
+    def __init__(self, runner, group, timeout, on_done, on_error, on_progress, on_cancel):
+        self.group = group
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.future = None
+        self.state = "running"  # then "done", "failed", "cancelled" or "timed out"
+        self.cancel_event = threading.Event()  # set by cancel() and timeouts
+        self._runner = runner
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def report(self, *values):
+        """Send progress from the worker; the UI sees only the latest report per poll."""
+        self._runner._queue.put((self, values))
+
+    def cancel(self):
+        if self.state == "running":
+            self._runner._finish(self, "cancelled")
+
+
+class TaskRunner:
+    """Thread/process pools whose results are delivered on the Tk thread.
+
+    Workers never touch widgets: completions and progress reports go through
+    a queue that an after() loop drains every POLL_MS while any task is
+    running, and every callback runs on the Tk thread. Tasks in the same
+    `lane` run one at a time in submission order. `on_busy(group, busy)` is
+    called when the first task of a group starts and the last one ends.
+    """
+
+    POLL_MS = 16
+
+    def __init__(self, after, max_threads=4, on_busy=None):
+        self._after = after
+        self.max_threads = max_threads
+        self.on_busy = on_busy
+        self._threads = None
+        self._processes = None
+        self._lanes = {}
+        self._queue = queue.SimpleQueue()
+        self._active = set()
+        self._busy = {}
+        self._polling = False
+
+    def submit(self, fn, *args, group=None, process=False, lane=None, timeout=None, pass_task=False,
+               on_done=None, on_error=None, on_progress=None, on_cancel=None, **kwargs):
+        """Run `fn(*args, **kwargs)` in the background and return its Task.
+
+        `on_done(result)`, `on_error(exception)`, `on_progress(*values)` and
+        `on_cancel()` run on the Tk thread. A timeout ends the task with a
+        TimeoutError passed to `on_error`. Process tasks need a picklable
+        module-level `fn` and cannot report progress.
+        """
+        if process and (pass_task or lane):
+            raise ValueError("Process tasks cannot receive their Task or run in a lane.")
+        task = Task(self, group, timeout, on_done, on_error, on_progress, on_cancel)
+        if pass_task:
+            args = (task,) + args
+        task.future = self._executor(process, lane).submit(fn, *args, **kwargs)
+        self._active.add(task)
+        if group is not None:
+            self._busy[group] = self._busy.get(group, 0) + 1
+            if self._busy[group] == 1 and self.on_busy is not None:
+                self.on_busy(group, True)
+        task.future.add_done_callback(lambda future: self._queue.put((task, None)))
+        self._start_polling()
+        return task
+
+    def busy(self, group):
+        return self._busy.get(group, 0) > 0
+
+    def shutdown(self):
+        for task in list(self._active):
+            self._finish(task, "cancelled", notify=False)
+        for executor in [self._threads, self._processes, *self._lanes.values()]:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self, process, lane):
+        if lane is not None:
+            if lane not in self._lanes:
+                self._lanes[lane] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"toolbox-{lane}")
+            return self._lanes[lane]
+        if process:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor()
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="toolbox-task")
+        return self._threads
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self._after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        try:
+            self._deliver()
+        finally:
+            # A failing callback must not strand the other tasks.
+            if self._active:
+                self._start_polling()
+
+    def _deliver(self):
+        progress = {}
+        finished = []
+        while True:
+            try:
+                task, values = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if values is None:
+                finished.append(task)
+            else:
+                progress[task] = values
+        errors = []
+        for task, values in progress.items():
+            if task.state == "running" and task.on_progress is not None:
+                task.on_progress(*values)
+        for task in finished:
+            if task.state != "running":
+                continue
+            if task.future.cancelled():
+                self._finish(task, "cancelled")
+                continue
+            error = task.future.exception()
+            self._finish(task, "done" if error is None else "failed")
+            if error is None:
+                if task.on_done is not None:
+                    task.on_done(task.future.result())
+            elif task.on_error is not None:
+                task.on_error(error)
+            else:
+                errors.append(error)
+        now = time.monotonic()
+        for task in list(self._active):
+            if task.deadline is not None and now >= task.deadline:
+                self._finish(task, "timed out")
+                error = TimeoutError("The operation took too long and was abandoned.")
+                if task.on_error is not None:
+                    task.on_error(error)
+                else:
+                    errors.append(error)
+        if errors:
+            raise errors[0]
+
+    def _finish(self, task, state, notify=True):
+        task.state = state
+        self._active.discard(task)
+        if state in ("cancelled", "timed out"):
+            task.cancel_event.set()
+            task.future.cancel()
+        if task.group is not None:
+            self._busy[task.group] -= 1
+            if not self._busy[task.group]:
+                del self._busy[task.group]
+                if self.on_busy is not None and notify:
+                    self.on_busy(task.group, False)
+        if state == "cancelled" and notify and task.on_cancel is not None:
+            task.on_cancel()
+
 
 class ToolboxApp(tk.Tk):
     def __init__(self):
+        init_start = time.perf_counter()
         super().__init__()
+        self.startup_timings = {}
         self.title("Toolbox v1.0.0")
         self.style = ttk.Style(self)
         self.style.theme_use("clam")
@@ -53,33 +540,168 @@ class ToolboxApp(tk.Tk):
         self.notebook.add(self.qr_generator_frame, text="QR Generator")
         self.notebook.add(self.alarm_frame, text="Alarm")
 
-        # Build each tool's UI
-        self._build_timer_ui()
-        self._build_stopwatch_ui()
-        self._build_calculator_ui()
-        self._build_notepad_ui()
-        self._build_password_generator_ui()
-        self._build_unit_converter_ui()
-        self._build_currency_converter_ui()
-        self._build_qr_generator_ui()
-        self._build_alarm_ui()
+        # Each tool's UI is built the first time its tab is selected
+        self._tab_builders = {
+            str(self.timer_frame): ("Timer", self._build_timer_ui),
+            str(self.stopwatch_frame): ("Stopwatch", self._build_stopwatch_ui),
+            str(self.calculator_frame): ("Calculator", self._build_calculator_ui),
+            str(self.notepad_frame): ("Notepad", self._build_notepad_ui),
+            str(self.password_frame): ("PassGen", self._build_password_generator_ui),
+            str(self.unit_converter_frame): ("Unit Converter", self._build_unit_converter_ui),
+            str(self.currency_converter_frame): ("Currency Converter", self._build_currency_converter_ui),
+            str(self.qr_generator_frame): ("QR Generator", self._build_qr_generator_ui),
+            str(self.alarm_frame): ("Alarm", self._build_alarm_ui),
+        }
+        self._built_tabs = set()
+        # Timer, Stopwatch and Alarm share one wakeup and skip widget updates
+        # while their tab is hidden or the window is minimized.
+        self.refresh_scheduler = RefreshScheduler(self.after, self.after_cancel)
+        # Slow work runs on a shared pool; a tab shows "..." while it has tasks.
+        self.tasks = TaskRunner(self.after, on_busy=self._on_tab_busy)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.bind("<Map>", self._on_window_state_changed)
+        self.bind("<Unmap>", self._on_window_state_changed)
+        self.bind_all("<F12>", self.toggle_debug_overlay)
+        self.debug_overlay = None
+        self._ensure_tab_built(self.notebook.select())
+
+        self._start_alarm_scheduler()
+
+        self.startup_timings["init"] = time.perf_counter() - init_start
+        self.after_idle(self._record_first_frame)
+
+    # ---------------------- LAZY TABS & STARTUP TIMINGS ---------------------- #
+    def _on_tab_changed(self, event=None):
+        self._ensure_tab_built(self.notebook.select())
+        self.refresh_scheduler.visibility_changed()
+
+    def _on_window_state_changed(self, event):
+        if event.widget is self:
+            self.refresh_scheduler.visibility_changed()
+
+    def _on_tab_busy(self, frame, busy):
+        name = self._tab_builders[str(frame)][0]
+        self.notebook.tab(frame, text=f"{name} \u2026" if busy else name)
+
+    def destroy(self):
+        for stop in self._alarm_sound_stops:
+            stop.set()
+        self.tasks.shutdown()
+        super().destroy()
+
+    def _tab_visible(self, frame):
+        return self.notebook.select() == str(frame) and self.state() not in ("iconic", "withdrawn")
+
+    def _ensure_tab_built(self, tab_id):
+        tab_id = str(tab_id)
+        if not tab_id or tab_id in self._built_tabs:
+            return
+        name, builder = self._tab_builders[tab_id]
+        self._built_tabs.add(tab_id)
+        start = time.perf_counter()
+        builder()
+        self.startup_timings[f"tab:{name}"] = time.perf_counter() - start
+
+    def _record_first_frame(self):
+        self.startup_timings["first_frame"] = time.perf_counter() - _PROCESS_START
+
+    def startup_report(self):
+        lines = ["Startup timings (ms):"]
+        for key, seconds in self.startup_timings.items():
+            lines.append(f"  {key:<28}{seconds * 1000:9.2f}")
+        for module_name, seconds in _import_timings.items():
+            lines.append(f"  {'import:' + module_name:<28}{seconds * 1000:9.2f}")
+        return "\n".join(lines)
+
+    # ---------------------- DEBUG OVERLAY ---------------------- #
+    # F12 shows callback timings and main-loop lag; profiling runs only while
+    # the overlay is open, or for the whole session with --profile.
+    DEBUG_REFRESH_MS = 500
+
+    def after(self, ms, func=None, *args):
+        if func is not None and PROFILER.enabled:
+            func = _TimedAfter(func, ms)
+        return super().after(ms, func, *args)
+
+    def toggle_debug_overlay(self, event=None):
+        if self.debug_overlay is not None:
+            self.debug_overlay.destroy()
+            return
+        self._profiler_was_enabled = PROFILER.enabled
+        PROFILER.enabled = True
+        overlay = self.debug_overlay = tk.Toplevel(self)
+        overlay.title("Debug: callback timings")
+        overlay.geometry("760x360")
+        overlay.bind("<Destroy>", self._on_debug_overlay_closed)
+        self.debug_lag_label = ttk.Label(overlay, text="")
+        self.debug_lag_label.pack(pady=5)
+        buckets = [f"<={ms}" for ms in CallbackProfiler.HISTOGRAM_BUCKETS_MS] + [f">{CallbackProfiler.HISTOGRAM_BUCKETS_MS[-1]}"]
+        columns = ("kind", "count", "mean", "p95", "max", "total", "histogram")
+        self.debug_tree = ttk.Treeview(overlay, columns=columns, height=12)
+        self.debug_tree.heading("#0", text="Callback")
+        self.debug_tree.column("#0", width=260)
+        for column, text in zip(columns, ("Kind", "Calls", "Mean ms", "p95 ms", "Max ms", "Total ms", " ".join(buckets) + " ms")):
+            self.debug_tree.heading(column, text=text)
+            self.debug_tree.column(column, width=200 if column == "histogram" else 60, anchor="e")
+        self.debug_tree.pack(fill="both", expand=True, padx=5)
+        buttons = ttk.Frame(overlay)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Reset", command=PROFILER.reset).grid(row=0, column=0, padx=5)
+        ttk.Button(buttons, text="Export JSON", command=lambda: self.export_profile(trace=False)).grid(row=0, column=1, padx=5)
+        ttk.Button(buttons, text="Export Chrome Trace", command=lambda: self.export_profile(trace=True)).grid(row=0, column=2, padx=5)
+        self._refresh_debug_overlay()
+
+    def _on_debug_overlay_closed(self, event):
+        if event.widget is self.debug_overlay:
+            self.debug_overlay = None
+            PROFILER.enabled = self._profiler_was_enabled
+
+    def _refresh_debug_overlay(self):
+        if self.debug_overlay is None:
+            return
+        lag = PROFILER.lag_summary()
+        self.debug_lag_label.config(
+            text=f"Main-loop lag over {lag['count']:,} after() callbacks: "
+                 f"p50 {lag['p50_ms']:.1f} ms   p95 {lag['p95_ms']:.1f} ms   max {lag['max_ms']:.1f} ms"
+        )
+        self.debug_tree.delete(*self.debug_tree.get_children())
+        for row in PROFILER.summary()[:200]:
+            self.debug_tree.insert("", tk.END, text=row["name"], values=(
+                row["kind"], row["count"], f"{row['mean_ms']:.2f}", f"{row['p95_ms']:.2f}",
+                f"{row['max_ms']:.2f}", f"{row['total_ms']:.1f}", " ".join(map(str, row["histogram"])),
+            ))
+        self.after(self.DEBUG_REFRESH_MS, self._refresh_debug_overlay)
+
+    def export_profile(self, trace=False):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", title="Export Profile", filetypes=[("JSON Files", "*.json")])
+        if file_path:
+            try:
+                with open(file_path, "w", encoding="utf-8") as file:
+                    json.dump(PROFILER.to_chrome_trace() if trace else PROFILER.to_json(), file)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not export profile:\n{str(e)}")
 
     # ---------------------- TIMER FUNCTIONS ---------------------- #
+    DEFAULT_TIMER_NAME = "Timer"
+
     def _build_timer_ui(self):
         self.timer_label = ttk.Label(self.timer_frame, text="00:00:00", font=("Helvetica", 48))
         self.timer_label.pack(pady=20)
 
         entry_frame = ttk.Frame(self.timer_frame)
         entry_frame.pack(pady=10)
+        self.timer_name_var = tk.StringVar(value=self.DEFAULT_TIMER_NAME)
         self.hours_var = tk.StringVar(value="0")
         self.minutes_var = tk.StringVar(value="0")
         self.seconds_var = tk.StringVar(value="0")
-        ttk.Label(entry_frame, text="Hours:").grid(row=0, column=0, padx=5)
-        ttk.Entry(entry_frame, width=3, textvariable=self.hours_var).grid(row=0, column=1, padx=5)
-        ttk.Label(entry_frame, text="Min:").grid(row=0, column=2, padx=5)
-        ttk.Entry(entry_frame, width=3, textvariable=self.minutes_var).grid(row=0, column=3, padx=5)
-        ttk.Label(entry_frame, text="Sec:").grid(row=0, column=4, padx=5)
-        ttk.Entry(entry_frame, width=3, textvariable=self.seconds_var).grid(row=0, column=5, padx=5)
+        ttk.Label(entry_frame, text="Name:").grid(row=0, column=0, padx=5)
+        ttk.Entry(entry_frame, width=12, textvariable=self.timer_name_var).grid(row=0, column=1, padx=5)
+        ttk.Label(entry_frame, text="Hours:").grid(row=0, column=2, padx=5)
+        ttk.Entry(entry_frame, width=3, textvariable=self.hours_var).grid(row=0, column=3, padx=5)
+        ttk.Label(entry_frame, text="Min:").grid(row=0, column=4, padx=5)
+        ttk.Entry(entry_frame, width=3, textvariable=self.minutes_var).grid(row=0, column=5, padx=5)
+        ttk.Label(entry_frame, text="Sec:").grid(row=0, column=6, padx=5)
+        ttk.Entry(entry_frame, width=3, textvariable=self.seconds_var).grid(row=0, column=7, padx=5)
 
         controls_frame = ttk.Frame(self.timer_frame)
         controls_frame.pack(pady=10)
@@ -90,56 +712,122 @@ class ToolboxApp(tk.Tk):
         self.timer_reset_button = ttk.Button(controls_frame, text="Reset Timer", command=self.reset_timer)
         self.timer_reset_button.grid(row=0, column=2, padx=5)
 
-        self.timer_running = False
-        self.timer_remaining = 0
+        self.timer_tree = ttk.Treeview(self.timer_frame, columns=("remaining", "state"), height=6)
+        self.timer_tree.heading("#0", text="Timer")
+        self.timer_tree.heading("remaining", text="Remaining")
+        self.timer_tree.heading("state", text="State")
+        self.timer_tree.pack(pady=10, fill="both", expand=True, padx=20)
+        self.timer_tree.bind("<<TreeviewSelect>>", self._on_timer_selected)
+
+        self.timer_engine = TimerEngine()
+        self._shown_timer = self.DEFAULT_TIMER_NAME
+        # Expiry must be noticed while the tab is hidden, so the timer ticks in
+        # the background; the label and list are only redrawn when visible.
+        self.refresh_scheduler.register("timer", self._timer_tick, rate=20, background=True,
+                                        visible=lambda: self._tab_visible(self.timer_frame))
 
     def start_timer(self):
-        if not self.timer_running:
+        name = self.timer_name_var.get().strip() or self.DEFAULT_TIMER_NAME
+        timer = self.timer_engine.timers.get(name)
+        if timer is not None and timer.state == "paused":
+            self.timer_engine.resume(name)
+        elif timer is None or timer.state == "done":
             try:
                 hours = int(self.hours_var.get())
                 minutes = int(self.minutes_var.get())
                 seconds = int(self.seconds_var.get())
             except ValueError:
                 return
-            self.timer_remaining = hours * 3600 + minutes * 60 + seconds
-            if self.timer_remaining > 0:
-                self.timer_running = True
-                self._run_timer()
-
-    def _run_timer(self):
-        if self.timer_running and self.timer_remaining >= 0:
-            hrs = self.timer_remaining // 3600
-            mins = (self.timer_remaining % 3600) // 60
-            secs = self.timer_remaining % 60
-            self.timer_label.config(text=f"{hrs:02d}:{mins:02d}:{secs:02d}")
-            if self.timer_remaining == 0:
-                self.timer_running = False
-                messagebox.showinfo("Time's Up", "The timer has ended!")
+            total = hours * 3600 + minutes * 60 + seconds
+            if total <= 0:
                 return
-            else:
-                self.timer_remaining -= 1
-                self.after(1000, self._run_timer)
+            self.timer_engine.start(name, total)
+        self._shown_timer = name
+        self.refresh_scheduler.wake("timer")
 
     def stop_timer(self):
-        self.timer_running = False
+        if self._shown_timer in self.timer_engine.timers:
+            self.timer_engine.pause(self._shown_timer)
+            self.refresh_scheduler.wake("timer")
 
     def reset_timer(self):
-        self.stop_timer()
-        self.timer_label.config(text="00:00:00")
+        self.timer_engine.remove(self._shown_timer)
+        self.refresh_scheduler.wake("timer")
+
+    def _on_timer_selected(self, event=None):
+        selection = self.timer_tree.selection()
+        if selection:
+            self._shown_timer = selection[0]
+            self.timer_name_var.set(selection[0])
+            self._refresh_timer_views()
+
+    def _timer_tick(self, visible):
+        engine = self.timer_engine
+        for name in engine.pop_expired():
+            # Deferred so the modal box never runs inside the scheduler.
+            self.after_idle(messagebox.showinfo, "Time's Up", f"The timer '{name}' has ended!")
+        if visible:
+            self._refresh_timer_views()
+        # Wake at the nearest deadline, or when the big label's whole-second
+        # display next changes if that is sooner and the tab is visible.
+        deadline = engine.next_deadline()
+        if deadline is None:
+            return None
+        delay = deadline - engine.clock()
+        shown = engine.timers.get(self._shown_timer)
+        if visible and shown is not None and shown.state == "running":
+            fraction = engine.remaining(self._shown_timer) % 1.0
+            delay = min(delay, fraction or 1.0)
+        return delay
+
+    def _refresh_timer_views(self):
+        engine = self.timer_engine
+        if self._shown_timer in engine.timers:
+            self.timer_label.config(text=format_hms(math.ceil(engine.remaining(self._shown_timer))))
+        else:
+            self.timer_label.config(text="00:00:00")
+        existing = set(self.timer_tree.get_children())
+        for name, timer in engine.timers.items():
+            values = (format_hms(math.ceil(engine.remaining(name))), timer.state.capitalize())
+            if name in existing:
+                self.timer_tree.item(name, values=values)
+                existing.discard(name)
+            else:
+                self.timer_tree.insert("", tk.END, iid=name, text=name, values=values)
+        for name in existing:
+            self.timer_tree.delete(name)
 
     # ---------------------- STOPWATCH FUNCTIONS ---------------------- #
+    STOPWATCH_PRECISIONS = {"1 s": 0, "0.1 s": 1, "0.01 s": 2, "0.001 s": 3}
+    # Redraws per second at most; finer precision than a frame cannot be seen.
+    STOPWATCH_FRAME_RATE = 60
+
     def _build_stopwatch_ui(self):
         self.stopwatch_label = ttk.Label(self.stopwatch_frame, text="00:00:00.00", font=("Helvetica", 48))
         self.stopwatch_label.pack(pady=20)
-        self.lap_listbox = tk.Listbox(self.stopwatch_frame, height=6)
-        self.lap_listbox.pack(pady=10, fill="both", expand=True)
+
+        # Virtualized lap list: the Listbox only ever holds the visible rows.
+        laps_frame = ttk.Frame(self.stopwatch_frame)
+        laps_frame.pack(pady=10, fill="both", expand=True)
+        self.lap_listbox = tk.Listbox(laps_frame, height=6, activestyle="none")
+        self.lap_listbox.pack(side="left", fill="both", expand=True)
+        self.lap_scrollbar = ttk.Scrollbar(laps_frame, orient="vertical", command=self._scroll_laps)
+        self.lap_scrollbar.pack(side="right", fill="y")
+        self.lap_listbox.bind("<Configure>", lambda event: self._render_laps())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.lap_listbox.bind(sequence, self._on_lap_wheel)
+        self.lap_stats_label = ttk.Label(self.stopwatch_frame, text="")
+        self.lap_stats_label.pack(pady=2)
 
         controls_frame = ttk.Frame(self.stopwatch_frame)
         controls_frame.pack(pady=10)
         self.stopwatch_running = False
         self.stopwatch_start_time = None
         self.elapsed_time = 0.0
-        self.lap_times = []
+        self.laps = LapStore()
+        self._lap_top = 0
+        self._lap_follow = True
+        self._lap_linespace = None
 
         self.sw_start_button = ttk.Button(controls_frame, text="Start", command=self.start_stopwatch)
         self.sw_start_button.grid(row=0, column=0, padx=5)
@@ -149,69 +837,180 @@ class ToolboxApp(tk.Tk):
         self.sw_reset_button.grid(row=0, column=2, padx=5)
         self.lap_button = ttk.Button(controls_frame, text="Lap", command=self.record_lap)
         self.lap_button.grid(row=0, column=3, padx=5)
+        self.lap_export_button = ttk.Button(controls_frame, text="Export CSV", command=self.export_laps)
+        self.lap_export_button.grid(row=0, column=4, padx=5)
+        ttk.Label(controls_frame, text="Precision:").grid(row=0, column=5, padx=5)
+        self.stopwatch_precision = tk.StringVar(value="0.01 s")
+        precision_combo = ttk.Combobox(controls_frame, textvariable=self.stopwatch_precision, values=list(self.STOPWATCH_PRECISIONS), width=7, state="readonly")
+        precision_combo.grid(row=0, column=6, padx=5)
+        precision_combo.bind("<<ComboboxSelected>>", self._on_stopwatch_precision_changed)
+        # The elapsed time is derived from perf_counter, so nothing needs to
+        # tick while the tab is hidden.
+        self.refresh_scheduler.register("stopwatch", self._stopwatch_tick, rate=self.STOPWATCH_FRAME_RATE,
+                                        visible=lambda: self._tab_visible(self.stopwatch_frame))
+
+    def _stopwatch_decimals(self):
+        return self.STOPWATCH_PRECISIONS[self.stopwatch_precision.get()]
+
+    def _on_stopwatch_precision_changed(self, event=None):
+        self.refresh_scheduler.wake("stopwatch")
+        self._render_laps()
 
     def start_stopwatch(self):
         if not self.stopwatch_running:
             self.stopwatch_start_time = time.perf_counter() - self.elapsed_time
             self.stopwatch_running = True
-            self._update_stopwatch()
+            self.refresh_scheduler.wake("stopwatch")
 
-    def _update_stopwatch(self):
+    def _stopwatch_tick(self, visible):
         if self.stopwatch_running:
             self.elapsed_time = time.perf_counter() - self.stopwatch_start_time
-            mins, secs = divmod(self.elapsed_time, 60)
-            hours, mins = divmod(mins, 60)
-            self.stopwatch_label.config(text=f"{int(hours):02d}:{int(mins):02d}:{secs:05.2f}")
-            self.after(10, self._update_stopwatch)
+        self._redraw_stopwatch()
+        if not self.stopwatch_running:
+            return None
+        # Wake when the shown digits next change; the scheduler caps the rate.
+        step = 10 ** -self._stopwatch_decimals()
+        return step - self.elapsed_time % step
+
+    def _redraw_stopwatch(self):
+        # Only the time changes per tick; the lap list is redrawn when a lap
+        # is added, the list scrolls or resizes, or the precision changes.
+        self.stopwatch_label.config(text=format_elapsed(self.elapsed_time, self._stopwatch_decimals()))
 
     def stop_stopwatch(self):
+        if self.stopwatch_running:
+            self.elapsed_time = time.perf_counter() - self.stopwatch_start_time
         self.stopwatch_running = False
+        self.refresh_scheduler.wake("stopwatch")
 
     def reset_stopwatch(self):
         self.stop_stopwatch()
         self.elapsed_time = 0.0
-        self.stopwatch_label.config(text="00:00:00.00")
-        self.lap_listbox.delete(0, tk.END)
-        self.lap_times = []
+        self.laps.clear()
+        self._lap_top = 0
+        self._lap_follow = True
+        self._redraw_stopwatch()
+        self._render_laps()
+        self.lap_stats_label.config(text="")
 
     def record_lap(self):
         if self.stopwatch_running:
-            lap_time = self.elapsed_time
-            self.lap_times.append(lap_time)
-            lap_number = len(self.lap_times)
-            mins, secs = divmod(lap_time, 60)
-            hours, mins = divmod(mins, 60)
-            formatted_time = f"{int(hours):02d}:{int(mins):02d}:{secs:05.2f}"
-            self.lap_listbox.insert(tk.END, f"Lap {lap_number}: {formatted_time}")
+            self.elapsed_time = time.perf_counter() - self.stopwatch_start_time
+            self.laps.record(self.elapsed_time)
+            decimals = self._stopwatch_decimals()
+            laps = self.laps
+            self.lap_stats_label.config(
+                text=f"Best: Lap {laps.best + 1} {format_elapsed(laps.laps[laps.best], decimals)}   "
+                     f"Worst: Lap {laps.worst + 1} {format_elapsed(laps.laps[laps.worst], decimals)}   "
+                     f"Mean: {format_elapsed(laps.mean, decimals)}   Std dev: {laps.stddev:.{max(decimals, 1)}f} s"
+            )
+            self._render_laps()
+
+    def _visible_lap_rows(self):
+        if self._lap_linespace is None:
+            self._lap_linespace = tkfont.Font(font=self.lap_listbox.cget("font")).metrics("linespace")
+        return max(1, self.lap_listbox.winfo_height() // max(self._lap_linespace + 1, 1))
+
+    def _render_laps(self):
+        total = len(self.laps)
+        rows = self._visible_lap_rows()
+        if self._lap_follow:
+            self._lap_top = max(0, total - rows)
+        self._lap_top = max(0, min(self._lap_top, total - rows))
+        top = self._lap_top
+        decimals = self._stopwatch_decimals()
+        laps, splits = self.laps.laps, self.laps.splits
+        self.lap_listbox.delete(0, tk.END)
+        for index in range(top, min(total, top + rows)):
+            self.lap_listbox.insert(tk.END, f"Lap {index + 1}: {format_elapsed(splits[index], decimals)}   (+{format_elapsed(laps[index], decimals)})")
+        if total:
+            self.lap_scrollbar.set(top / total, min(1.0, (top + rows) / total))
+        else:
+            self.lap_scrollbar.set(0.0, 1.0)
+
+    def _scroll_laps_to(self, top):
+        rows = self._visible_lap_rows()
+        self._lap_top = top
+        self._lap_follow = top >= len(self.laps) - rows
+        self._render_laps()
+
+    def _scroll_laps(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_laps_to(int(float(amount) * len(self.laps)))
+        elif unit == "pages":
+            self._scroll_laps_to(self._lap_top + int(amount) * self._visible_lap_rows())
+        else:
+            self._scroll_laps_to(self._lap_top + int(amount))
+
+    def _on_lap_wheel(self, event):
+        step = -3 if event.num == 4 or getattr(event, "delta", 0) > 0 else 3
+        self._scroll_laps_to(self._lap_top + step)
+        return "break"
+
+    def export_laps(self):
+        if not len(self.laps):
+            messagebox.showwarning("Warning", "No laps to export!")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", title="Export Laps", filetypes=[("CSV Files", "*.csv")])
+        if file_path:
+            try:
+                with open(file_path, "w", newline="", encoding="utf-8") as file:
+                    self.laps.write_csv(file)
+                messagebox.showinfo("Success", f"Exported {len(self.laps):,} laps.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not export laps:\n{str(e)}")
 
     # ---------------------- CALCULATOR FUNCTIONS ---------------------- #
     def _build_calculator_ui(self):
         self.calc_expression = ""
+        self._calc_preview_job = None
         self.calc_entry = ttk.Entry(self.calculator_frame, font=("Helvetica", 24), justify="right")
-        self.calc_entry.grid(row=0, column=0, columnspan=4, padx=10, pady=10, sticky="nsew")
+        self.calc_entry.grid(row=0, column=0, columnspan=4, padx=10, pady=(10, 0), sticky="nsew")
+        self.calc_entry.bind("<KeyRelease>", self._on_calc_entry_edit)
+        self.calc_entry.bind("<Return>", lambda event: self.on_calc_button_click("="))
+        self.calc_preview_label = ttk.Label(self.calculator_frame, text="", font=("Helvetica", 12), anchor="e")
+        self.calc_preview_label.grid(row=1, column=0, columnspan=4, padx=10, sticky="ew")
 
         buttons = [
             ["7", "8", "9", "/"],
             ["4", "5", "6", "*"],
             ["1", "2", "3", "-"],
             ["0", ".", "=", "+"],
-            ["C"]
+            ["C", "(", ")", "^"],
+            ["%", "sqrt(", "pi", "e"],
         ]
 
-        for r, row in enumerate(buttons, start=1):
+        for r, row in enumerate(buttons, start=2):
             for c, char in enumerate(row):
                 button = ttk.Button(self.calculator_frame, text=char, command=lambda ch=char: self.on_calc_button_click(ch))
                 button.grid(row=r, column=c, padx=5, pady=5, sticky="nsew")
 
-        for i in range(len(buttons) + 1):
+        for i in range(len(buttons) + 2):
             self.calculator_frame.rowconfigure(i, weight=1)
+        self.calculator_frame.rowconfigure(1, weight=0)
         for j in range(4):
             self.calculator_frame.columnconfigure(j, weight=1)
 
+        # Table mode: the expression above is evaluated over every row of a
+        # CSV file, with its column names as variables.
+        table_frame = ttk.LabelFrame(self.calculator_frame, text="Table Mode")
+        table_frame.grid(row=len(buttons) + 2, column=0, columnspan=4, padx=10, pady=(0, 10), sticky="ew")
+        ttk.Button(table_frame, text="Load CSV...", command=self.load_calc_table).grid(row=0, column=0, padx=5, pady=5)
+        self.calc_table_button = ttk.Button(table_frame, text="Evaluate to File...", command=self.evaluate_calc_table, state="disabled")
+        self.calc_table_button.grid(row=0, column=1, padx=5, pady=5)
+        self.calc_table_cancel = ttk.Button(table_frame, text="Cancel", command=self.cancel_calc_table, state="disabled")
+        self.calc_table_cancel.grid(row=0, column=2, padx=5, pady=5)
+        self.calc_table_columns = ttk.Label(table_frame, text="No file loaded")
+        self.calc_table_columns.grid(row=1, column=0, columnspan=3, padx=5, sticky="w")
+        self.calc_table_status = ttk.Label(table_frame, text="")
+        self.calc_table_status.grid(row=2, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+        self.calc_table_path = None
+        self._calc_table_task = None
+
     def on_calc_button_click(self, char):
         if char == "=":
             try:
-                result = eval(self.calc_expression)
+                result = evaluate_expression(self.calc_expression)
                 self.calc_expression = str(result)
             except Exception:
                 self.calc_expression = "Error"
@@ -224,22 +1023,147 @@ class ToolboxApp(tk.Tk):
             self.calc_expression += str(char)
             self.calc_entry.delete(0, tk.END)
             self.calc_entry.insert(tk.END, self.calc_expression)
+        self._schedule_calc_preview()
+
+    def _on_calc_entry_edit(self, event=None):
+        if self.calc_entry.get() != self.calc_expression:
+            self.calc_expression = self.calc_entry.get()
+            self._schedule_calc_preview()
+
+    def _schedule_calc_preview(self):
+        # Debounce so a burst of keystrokes evaluates once.
+        if self._calc_preview_job is not None:
+            self.after_cancel(self._calc_preview_job)
+        self._calc_preview_job = self.after(150, self._update_calc_preview)
+
+    def _update_calc_preview(self):
+        self._calc_preview_job = None
+        try:
+            text = f"= {evaluate_expression(self.calc_expression)}"
+        except Exception:
+            text = ""
+        self.calc_preview_label.config(text=text)
+
+    def load_calc_table(self):
+        file_path = filedialog.askopenfilename(title="Open CSV File", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
+        if not file_path:
+            return
+        try:
+            with open(file_path, "r", newline="", encoding="utf-8") as file:
+                header = next(csv.reader(file), None)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read the file:\n{str(e)}")
+            return
+        if not header:
+            messagebox.showerror("Error", "The CSV file is empty.")
+            return
+        self.calc_table_path = file_path
+        self.calc_table_columns.config(text=f"{os.path.basename(file_path)}: {', '.join(column_variable(name) for name in header)}")
+        self.calc_table_status.config(text="")
+        self.calc_table_button.config(state="normal")
+
+    def evaluate_calc_table(self):
+        expression = self.calc_entry.get().strip()
+        if not expression:
+            messagebox.showwarning("Warning", "Enter an expression using the column names.")
+            return
+        output_path = filedialog.asksaveasfilename(defaultextension=".csv", title="Save Results", filetypes=[("CSV Files", "*.csv")])
+        if not output_path:
+            return
+        src_path = self.calc_table_path
+        started = time.perf_counter()
+
+        def worker(task):
+            with open(src_path, "r", newline="", encoding="utf-8") as src, \
+                    open(output_path, "w", newline="", encoding="utf-8") as dst:
+                return evaluate_csv_stream(src, dst, expression, progress=task.report, cancel=task.cancel_event)
+
+        def on_progress(rows):
+            elapsed = time.perf_counter() - started
+            self.calc_table_status.config(text=f"{rows:,} rows, {rows / max(elapsed, 1e-9):,.0f} rows/sec")
+
+        self.calc_table_button.config(state="disabled")
+        self.calc_table_cancel.config(state="normal")
+        self.calc_table_status.config(text="Evaluating...")
+        self._calc_table_task = self.tasks.submit(worker, pass_task=True, group=self.calculator_frame,
+                                                  on_progress=on_progress, on_done=self._on_calc_table_done,
+                                                  on_error=self._on_calc_table_error)
+
+    def cancel_calc_table(self):
+        if self._calc_table_task is not None:
+            self._calc_table_task.cancel_event.set()
+            self.calc_table_status.config(text="Cancelling...")
+
+    def _finish_calc_table(self):
+        self._calc_table_task = None
+        self.calc_table_button.config(state="normal")
+        self.calc_table_cancel.config(state="disabled")
+
+    def _on_calc_table_error(self, error):
+        self._finish_calc_table()
+        self.calc_table_status.config(text="")
+        messagebox.showerror("Error", f"Table evaluation failed:\n{str(error)}")
+
+    def _on_calc_table_done(self, summary):
+        self._finish_calc_table()
+        state = "Cancelled" if summary["cancelled"] else "Done"
+        self.calc_table_status.config(
+            text=f"{state}: {summary['rows']:,} rows ({summary['invalid']:,} invalid) in "
+                 f"{summary['seconds']:.1f} s, {summary['rows_per_sec']:,.0f} rows/sec"
+        )
 
     # ---------------------- ENHANCED NOTEPAD FUNCTIONS ---------------------- #
+    # Lines kept loaded above and below the visible window in large-file mode.
+    LARGE_FILE_MARGIN = 200
+    # Memory for inactive documents (compressed) before they are evicted to
+    # disk; overridden by TOOLBOX_NOTEPAD_CACHE_MB.
+    NOTEPAD_CACHE_MB = 64
+
     def _build_notepad_ui(self):
+        # Document tabs: every open document shares the one Text widget below.
+        self.doc_tabs = ttk.Notebook(self.notepad_frame)
+        self.doc_tabs.pack(fill="x", padx=5, pady=(5, 0))
+        self.doc_tabs.bind("<<NotebookTabChanged>>", self._on_doc_tab_changed)
+        self.documents = {}  # tab frame name -> Document
+        self._doc_frames = {}  # document id -> tab frame
+        self.active_doc = None
+        self._doc_loading = False
+        self._doc_generation = 0
+        budget_mb = float(os.environ.get("TOOLBOX_NOTEPAD_CACHE_MB", self.NOTEPAD_CACHE_MB))
+        self.doc_cache = DocumentCache(int(budget_mb * 1024 * 1024), os.path.join(DATA_DIR, "notepad_docs"))
+
         # Main text widget with default font
-        self.notepad_text = tk.Text(self.notepad_frame, wrap="word", font=("Helvetica", 12))
-        self.notepad_text.pack(expand=1, fill="both", padx=5, pady=5)
+        text_frame = ttk.Frame(self.notepad_frame)
+        text_frame.pack(expand=1, fill="both", padx=5, pady=5)
+        self.notepad_text = tk.Text(text_frame, wrap="word", font=("Helvetica", 12))
+        self.notepad_text.pack(side="left", expand=1, fill="both")
+        # Scrollbar over the whole file, only shown in large-file mode.
+        self.large_file_scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=self._large_file_scroll)
+        self.large_file = None
+        self._large_top = 0
+        self._large_window = (0, 0)
+        self._large_index_job = None
+        self.notepad_path = None
 
         # File operation buttons
         file_frame = ttk.Frame(self.notepad_frame)
         file_frame.pack(fill="x", padx=5, pady=5)
+        new_btn = ttk.Button(file_frame, text="New", command=self.new_notepad_document)
+        new_btn.pack(side="left", padx=5)
+        close_btn = ttk.Button(file_frame, text="Close", command=self.close_notepad_document)
+        close_btn.pack(side="left", padx=5)
         open_btn = ttk.Button(file_frame, text="Open", command=self.open_notepad_file)
         open_btn.pack(side="left", padx=5)
         save_btn = ttk.Button(file_frame, text="Save", command=self.save_notepad_file)
         save_btn.pack(side="left", padx=5)
-        clear_btn = ttk.Button(file_frame, text="Clear", command=lambda: self.notepad_text.delete(1.0, tk.END))
+        save_as_btn = ttk.Button(file_frame, text="Save As", command=lambda: self.save_notepad_file(save_as=True))
+        save_as_btn.pack(side="left", padx=5)
+        clear_btn = ttk.Button(file_frame, text="Clear", command=self.clear_notepad)
         clear_btn.pack(side="left", padx=5)
+        goto_btn = ttk.Button(file_frame, text="Go to Line", command=self.goto_notepad_line)
+        goto_btn.pack(side="left", padx=5)
+        self.notepad_status = ttk.Label(file_frame, text="")
+        self.notepad_status.pack(side="right", padx=5)
 
         # Text styling controls: Bold, Italic, and Font Size Adjustment.
         style_frame = ttk.Frame(self.notepad_frame)
@@ -257,27 +1181,716 @@ class ToolboxApp(tk.Tk):
         self.notepad_text.tag_configure("bold", font=("Helvetica", 12, "bold"))
         self.notepad_text.tag_configure("italic", font=("Helvetica", 12, "italic"))
 
+        self._build_notepad_search()
+        self._build_notepad_journal()
+
+    # Find/replace: matching runs on a worker thread over a snapshot of the
+    # buffer (or the mmap in large-file mode) and streams batches back through
+    # a queue. The sorted match list of the last query is kept so next and
+    # previous are a bisect away.
+    MAX_SEARCH_RESULTS = 100000
+
+    def _build_notepad_search(self):
+        search_frame = ttk.Frame(self.notepad_frame)
+        search_frame.pack(fill="x", padx=5, pady=5)
+        ttk.Label(search_frame, text="Find:").pack(side="left", padx=5)
+        self.find_var = tk.StringVar()
+        self.find_entry = ttk.Entry(search_frame, width=20, textvariable=self.find_var)
+        self.find_entry.pack(side="left", padx=5)
+        self.find_entry.bind("<Return>", lambda event: self.find_next())
+        self.find_entry.bind("<Shift-Return>", lambda event: self.find_next(backwards=True))
+        ttk.Label(search_frame, text="Replace:").pack(side="left", padx=5)
+        self.replace_var = tk.StringVar()
+        ttk.Entry(search_frame, width=20, textvariable=self.replace_var).pack(side="left", padx=5)
+        self.search_regex = tk.BooleanVar(value=False)
+        self.search_match_case = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Regex", variable=self.search_regex).pack(side="left", padx=5)
+        ttk.Checkbutton(search_frame, text="Match case", variable=self.search_match_case).pack(side="left", padx=5)
+        ttk.Button(search_frame, text="Prev", command=lambda: self.find_next(backwards=True)).pack(side="left", padx=2)
+        ttk.Button(search_frame, text="Next", command=self.find_next).pack(side="left", padx=2)
+        ttk.Button(search_frame, text="Replace All", command=self.replace_all).pack(side="left", padx=5)
+        self.search_status = ttk.Label(search_frame, text="")
+        self.search_status.pack(side="left", padx=5)
+
+        self.notepad_text.tag_configure("search", background="#fff2a8")
+        self.notepad_text.tag_configure("search_current", background="#f9a825")
+        self.notepad_text.tag_raise("sel")
+        self.notepad_text.bind("<Control-f>", self._focus_find_entry)
+
+        self._search_matches = []
+        self._search_key = None
+        self._search_stale = False
+        self._search_done = True
+        self._search_generation = 0
+        self._search_cancel = threading.Event()
+        self._search_results = queue.Queue()
+        self._search_jump = None
+        self._search_poll_job = None
+
+    def _focus_find_entry(self, event=None):
+        self.find_entry.focus_set()
+        self.find_entry.select_range(0, tk.END)
+        return "break"
+
+    def _search_query_key(self):
+        return (self.find_var.get(), self.search_regex.get(), self.search_match_case.get())
+
+    def _reset_search(self):
+        self._search_cancel.set()
+        self._search_generation += 1
+        self._search_matches = []
+        self._search_key = None
+        self._search_done = True
+        self.notepad_text.tag_remove("search", 1.0, tk.END)
+        self.notepad_text.tag_remove("search_current", 1.0, tk.END)
+        self.search_status.config(text="")
+
+    def find_next(self, backwards=False):
+        key = self._search_query_key()
+        if not key[0]:
+            return
+        if key != self._search_key or self._search_stale:
+            self._start_search(key)
+            self._search_jump = backwards
+        elif self._search_done or self._search_matches:
+            self._jump_to_match(backwards)
+
+    def _start_search(self, key):
+        self._reset_search()
+        query, regex, match_case = key
+        source = self.large_file.mm if self.large_file is not None else self.notepad_text.get(1.0, "end-1c")
+        try:
+            pattern = compile_search_pattern(query, regex, match_case, binary=self.large_file is not None)
+        except re.error as e:
+            self.search_status.config(text=f"Invalid regex: {e}")
+            return
+        self._search_key = key
+        self._search_stale = False
+        self._search_done = False
+        self._search_cancel = threading.Event()
+        generation = self._search_generation
+        self.search_status.config(text="Searching...")
+        threading.Thread(target=self._search_worker, args=(generation, source, pattern, self._search_cancel), daemon=True).start()
+        if self._search_poll_job is None:
+            self._search_poll_job = self.after(30, self._poll_search_results)
+
+    def _search_worker(self, generation, source, pattern, cancelled):
+        found = 0
+        try:
+            for batch in find_text_matches(source, pattern, cancelled):
+                self._search_results.put((generation, batch))
+                found += len(batch)
+                if found >= self.MAX_SEARCH_RESULTS:
+                    break
+        except ValueError:
+            pass  # the large file was closed mid-search
+        self._search_results.put((generation, None))
+
+    def _poll_search_results(self):
+        self._search_poll_job = None
+        new_matches = []
+        done = False
+        while True:
+            try:
+                generation, batch = self._search_results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._search_generation:
+                continue
+            if batch is None:
+                done = True
+            else:
+                new_matches.extend(batch)
+        if new_matches:
+            self._search_matches.extend(new_matches)
+            if self.large_file is not None:
+                self._highlight_search_window()
+            else:
+                # One tag_add per batch, covering every range in it.
+                ranges = []
+                for line, col, end_line, end_col in new_matches:
+                    ranges += (f"{line + 1}.{col}", f"{end_line + 1}.{end_col}")
+                self.notepad_text.tag_add("search", *ranges)
+        count = len(self._search_matches)
+        if done:
+            self._search_done = True
+            suffix = "+" if count >= self.MAX_SEARCH_RESULTS else ""
+            self.search_status.config(text=f"{count:,}{suffix} matches" if count else "No matches")
+        else:
+            self.search_status.config(text=f"Searching... {count:,} matches")
+        if self._search_jump is not None and count and (done or self._next_match_index(False, wrap=False) is not None):
+            backwards, self._search_jump = self._search_jump, None
+            self._jump_to_match(backwards)
+        elif done:
+            self._search_jump = None
+        if not done:
+            self._search_poll_job = self.after(30, self._poll_search_results)
+
+    def _cursor_position(self):
+        line, col = (int(part) for part in self.notepad_text.index(tk.INSERT).split("."))
+        if self.large_file is not None:
+            line += self._large_window[0]
+        return line - 1, col
+
+    def _next_match_index(self, backwards, wrap=True):
+        matches = self._search_matches
+        if not matches:
+            return None
+        cursor = self._cursor_position()
+        if backwards:
+            index = bisect.bisect_left(matches, cursor) - 1
+            if index < 0:
+                return len(matches) - 1 if wrap else None
+        else:
+            index = bisect.bisect_right(matches, cursor + (math.inf, math.inf))
+            if index >= len(matches):
+                return 0 if wrap else None
+        return index
+
+    def _jump_to_match(self, backwards):
+        index = self._next_match_index(backwards)
+        if index is None:
+            return
+        line, col, end_line, end_col = self._search_matches[index]
+        if self.large_file is not None:
+            self._large_file_show(line - self._visible_line_count() // 3)
+            offset = self._large_window[0]
+            line, end_line = line - offset, end_line - offset
+        start, end = f"{line + 1}.{col}", f"{end_line + 1}.{end_col}"
+        self.notepad_text.tag_remove("search_current", 1.0, tk.END)
+        self.notepad_text.tag_add("search_current", start, end)
+        self.notepad_text.mark_set(tk.INSERT, start)
+        self.notepad_text.see(start)
+        self.search_status.config(text=f"{index + 1:,} of {len(self._search_matches):,}")
+
+    def _highlight_search_window(self):
+        # Large-file mode: only the matches inside the loaded window get tagged.
+        self.notepad_text.tag_remove("search", 1.0, tk.END)
+        start, stop = self._large_window
+        matches = self._search_matches
+        ranges = []
+        for line, col, end_line, end_col in matches[bisect.bisect_left(matches, (start,)):bisect.bisect_left(matches, (stop,))]:
+            ranges += (f"{line - start + 1}.{col}", f"{end_line - start + 1}.{end_col}")
+        if ranges:
+            self.notepad_text.tag_add("search", *ranges)
+
+    def replace_all(self):
+        if self.large_file is not None:
+            messagebox.showinfo("Info", "Large files are opened read-only and cannot be edited.")
+            return
+        query, regex, match_case = self._search_query_key()
+        if not query:
+            return
+        try:
+            pattern = compile_search_pattern(query, regex, match_case)
+        except re.error as e:
+            self.search_status.config(text=f"Invalid regex: {e}")
+            return
+        replacement = self.replace_var.get()
+        if not regex:
+            replacement = replacement.replace("\\", "\\\\")
+        content = self.notepad_text.get(1.0, "end-1c")
+        try:
+            # Empty regex matches are skipped, as in find_text_matches.
+            edits = [(match.start(), match.end(), match.expand(replacement))
+                     for match in pattern.finditer(content) if match.end() > match.start()]
+        except re.error as e:
+            self.search_status.config(text=f"Invalid replacement: {e}")
+            return
+        self._reset_search()
+        if edits:
+            self._replace_spans(content, edits)
+        self.search_status.config(text=f"Replaced {len(edits):,} matches")
+
+    def _replace_spans(self, content, edits):
+        # One widget call (and one journal edit) from the first match to the
+        # last; tags, the cursor and the scroll position are carried over.
+        text = self.notepad_text
+        first, last = edits[0][0], edits[-1][1]
+        pieces = []
+        position = first
+        ends = []
+        shifts = [0]
+        for start, end, replacement in edits:
+            pieces.append(content[position:start])
+            pieces.append(replacement)
+            position = end
+            ends.append(end)
+            shifts.append(shifts[-1] + len(replacement) - (end - start))
+        line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+
+        def offset(index):
+            line, col = map(int, str(index).split("."))
+            return line_starts[line - 1] + col
+
+        def moved(pos):
+            # Old offset to new: shifted past earlier matches, or snapped to
+            # the start of the replacement when inside a match.
+            k = bisect.bisect_right(ends, pos)
+            if k < len(edits) and edits[k][0] < pos:
+                return edits[k][0] + shifts[k]
+            return pos + shifts[k]
+
+        tags = {tag: [offset(index) for index in text.tag_ranges(tag)] for tag in ("bold", "italic")}
+        cursor = moved(offset(text.index(tk.INSERT)))
+        yview = text.yview()[0]
+        new_text = "".join(pieces)
+        text.replace(f"1.0+{first}c", f"1.0+{last}c", new_text)
+
+        # Indices counted in chars from the start; Tk resolves them directly.
+        for tag, offsets in tags.items():
+            text.tag_remove(tag, 1.0, tk.END)
+            for start, end in zip(offsets[::2], offsets[1::2]):
+                start, end = moved(start), moved(end)
+                if start < end:
+                    text.tag_add(tag, f"1.0+{start}c", f"1.0+{end}c")
+        text.mark_set(tk.INSERT, f"1.0+{cursor}c")
+        text.yview_moveto(yview)
+
+    # Autosave: every insert/delete on the Text widget is recorded into an
+    # EditJournal through a proxy on the widget's Tcl command. <<Modified>>
+    # schedules a flush, and all journal I/O runs in order on one task lane.
+    AUTOSAVE_DELAY_MS = 2000
+    JOURNAL_LANE = "notepad-journal"
+
+    def _build_notepad_journal(self):
+        self.notepad_journal = EditJournal(os.path.join(DATA_DIR, "notepad.journal"))
+        self._journal_active = False
+        self._autosave_job = None
+        widget = self.notepad_text._w
+        self._notepad_tk_cmd = widget + "_orig"
+        self.tk.call("rename", widget, self._notepad_tk_cmd)
+        # The proxy is a Tcl proc so errors from the real widget (e.g. "sel.first"
+        # with no selection, which Tk's own bindings catch) stay Tcl errors;
+        # only edits call into Python.
+        record = self.register(self._on_notepad_edit)
+        self.tk.eval(f"proc {widget} {{args}} {{\n"
+                     f"    if {{[lindex $args 0] in {{insert delete replace}}}} {{ {record} {{*}}$args }}\n"
+                     f"    uplevel 1 [list {self._notepad_tk_cmd} {{*}}$args]\n"
+                     f"}}")
+        self.notepad_text.bind("<<Modified>>", self._on_notepad_modified)
+
+        recovered = EditJournal.recover(self.notepad_journal.journal_path)
+        if recovered and messagebox.askyesno("Recover", "The Notepad has unsaved changes from a previous session. Recover them?"):
+            base_path, base_fingerprint, content = recovered
+            doc = self._add_document(base_path)
+            doc.revision = 1
+            doc.fingerprint = base_fingerprint
+            self._update_doc_tab(doc)
+            self.active_doc = doc
+            self._show_document(doc, content, reset_journal=False)
+            self.notepad_journal.resume(base_path, base_fingerprint)
+            self.notepad_status.config(text="Recovered unsaved changes")
+        else:
+            self._switch_document(self._add_document())
+
+        # Inactive documents with unsaved changes were spilled to disk.
+        spilled = self.doc_cache.recover()
+        if spilled and messagebox.askyesno(
+                "Recover", f"{len(spilled)} other Notepad document(s) had unsaved changes. Recover them?"):
+            for path, text in spilled:
+                doc = self._add_document(path)
+                doc.revision = 1
+                self._update_doc_tab(doc)
+                self.doc_cache.park(doc, text)
+
+    def _on_notepad_edit(self, *args):
+        # Called by the proxy proc before the edit reaches the widget.
+        if not self._journal_active:
+            return
+        try:
+            self._record_notepad_edit([str(arg) for arg in args])
+        except tk.TclError:
+            return  # bad index: the widget rejects the edit itself
+        doc = self.active_doc
+        doc.revision += 1
+        if doc.revision == doc.saved_revision + 1:
+            self._update_doc_tab(doc)
+
+    def _notepad_index(self, index):
+        # Normalize to "line.col" and clamp past the Text's implicit final newline.
+        cmd = self._notepad_tk_cmd
+        if self.tk.call(cmd, "compare", index, ">", "end-1c"):
+            index = "end-1c"
+        return str(self.tk.call(cmd, "index", index))
+
+    def _record_notepad_edit(self, args):
+        op = args[0]
+        if op == "insert":
+            self.notepad_journal.record_insert(self._notepad_index(args[1]), "".join(args[2::2]))
+            return
+        start = self._notepad_index(args[1])
+        if len(args) > 2:
+            end = self._notepad_index(args[2])
+        else:
+            end = self._notepad_index(f"{start}+1c")
+        if self.tk.call(self._notepad_tk_cmd, "compare", start, "<", end):
+            self.notepad_journal.record_delete(start, end)
+        if op == "replace":
+            self.notepad_journal.record_insert(start, "".join(args[3::2]))
+
+    def _on_notepad_modified(self, event=None):
+        if not self.notepad_text.edit_modified():
+            return
+        self.notepad_text.edit_modified(False)
+        if self.large_file is None:
+            self._search_stale = True
+        if self._autosave_job is None and self._journal_active:
+            self._autosave_job = self.after(self.AUTOSAVE_DELAY_MS, self._autosave_notepad)
+
+    def _autosave_notepad(self):
+        self._autosave_job = None
+        edits = self.notepad_journal.take_pending()
+        if edits:
+            self.tasks.submit(self.notepad_journal.append, edits, lane=self.JOURNAL_LANE)
+
+    def _load_notepad_content(self, content, path, reset_journal=True):
+        self._reset_search()
+        self._journal_active = False
+        self.notepad_text.delete(1.0, tk.END)
+        self.notepad_text.insert(tk.END, content)
+        self.notepad_text.edit_reset()
+        self.notepad_text.edit_modified(False)
+        self.notepad_path = path
+        self.notepad_journal.take_pending()
+        if reset_journal:
+            self.tasks.submit(self.notepad_journal.reset, path, lane=self.JOURNAL_LANE)
+        self._journal_active = True
+
+    # Documents: each tab is a Document model. Only the active one lives in
+    # the Text widget; switching parks it in the DocumentCache (compressed,
+    # evicted to disk past the budget) and restores the next one, reading it
+    # back on a worker if it was evicted. The journal follows the active
+    # document only.
+    def new_notepad_document(self):
+        self._switch_document(self._add_document())
+
+    def close_notepad_document(self):
+        self._close_document(self.active_doc)
+
+    def _add_document(self, path=None, large_file=None):
+        doc = Document(path, large_file)
+        frame = ttk.Frame(self.doc_tabs, height=0)
+        self.doc_tabs.add(frame, text=doc.title)
+        self.documents[str(frame)] = doc
+        self._doc_frames[doc.id] = frame
+        return doc
+
+    def _update_doc_tab(self, doc):
+        frame = self._doc_frames.get(doc.id)
+        if frame is not None:
+            self.doc_tabs.tab(frame, text=f"{doc.title} *" if doc.dirty else doc.title)
+
+    def _on_doc_tab_changed(self, event=None):
+        doc = self.documents.get(self.doc_tabs.select())
+        if doc is not None:
+            self._switch_document(doc)
+
+    def _switch_document(self, doc):
+        if doc is self.active_doc:
+            return
+        self._park_active_document()
+        self.active_doc = doc
+        self._doc_generation += 1
+        self.notepad_path = doc.path
+        self.doc_tabs.select(self._doc_frames[doc.id])
+        if doc.large_file is not None:
+            self._attach_large_file(doc)
+            return
+        if self.doc_cache.in_memory(doc) or (doc.path is None and doc.spill_path is None):
+            self._show_document(doc, self.doc_cache.read(doc))
+            return
+        # Evicted: the editor stays empty and read-only until the text is back.
+        generation = self._doc_generation
+        self._doc_loading = True
+        self._reset_search()
+        self.notepad_text.delete(1.0, tk.END)
+        self.notepad_text.config(state="disabled")
+        self.notepad_status.config(text="Loading...")
+
+        def on_read(text):
+            if generation == self._doc_generation:
+                self._show_document(doc, text)
+
+        def on_error(error):
+            self._on_notepad_io_error(error)
+            if doc.id in self._doc_frames:
+                self._close_document(doc, confirm=False)
+
+        self.tasks.submit(self.doc_cache.read, doc, group=self.notepad_frame, on_done=on_read, on_error=on_error)
+
+    def _park_active_document(self):
+        doc = self.active_doc
+        if doc is None:
+            return
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+            self._autosave_job = None
+        # Unflushed edits are kept in the parked text rather than the journal.
+        self.notepad_journal.take_pending()
+        self._journal_active = False
+        if doc.large_file is not None:
+            doc.yview = self._large_top
+            self._detach_large_file()
+        elif self._doc_loading:
+            # Never shown, so it simply stays evicted.
+            self._doc_loading = False
+            self.notepad_text.config(state="normal")
+        else:
+            doc.tags = {tag: [str(index) for index in self.notepad_text.tag_ranges(tag)] for tag in ("bold", "italic")}
+            doc.cursor = self.notepad_text.index(tk.INSERT)
+            doc.yview = self.notepad_text.yview()[0]
+            self.doc_cache.park(doc, self.notepad_text.get(1.0, "end-1c"))
+        self.active_doc = None
+
+    def _show_document(self, doc, text, reset_journal=True):
+        self._doc_loading = False
+        self.doc_cache.release(doc)
+        self.notepad_text.config(state="normal")
+        self.notepad_status.config(text="")
+        self._load_notepad_content(text, doc.path, reset_journal)
+        for tag, ranges in doc.tags.items():
+            if ranges:
+                self.notepad_text.tag_add(tag, *ranges)
+        self.notepad_text.mark_set(tk.INSERT, doc.cursor)
+        self.notepad_text.yview_moveto(doc.yview)
+        if doc.path and not doc.dirty:
+            try:
+                doc.fingerprint = EditJournal.fingerprint(doc.path)
+            except OSError:
+                doc.fingerprint = None
+        if reset_journal and doc.dirty:
+            # The buffer is not the file the journal was just reset to, so
+            # journal it whole to keep crash recovery exact.
+            self.notepad_journal.record_replace_all(text)
+            self._autosave_job = self.after(self.AUTOSAVE_DELAY_MS, self._autosave_notepad)
+
+    def _close_document(self, doc, confirm=True):
+        if confirm and doc.dirty and not messagebox.askyesno("Close", f"{doc.title} has unsaved changes. Close it anyway?"):
+            return
+        if doc is self.active_doc:
+            if self._autosave_job is not None:
+                self.after_cancel(self._autosave_job)
+                self._autosave_job = None
+            self.notepad_journal.take_pending()
+            self._journal_active = False
+            self._detach_large_file()
+            self._doc_loading = False
+            self.active_doc = None
+            self._doc_generation += 1
+        if doc.large_file is not None:
+            doc.large_file.close()
+        self.doc_cache.release(doc)
+        frame = self._doc_frames.pop(doc.id)
+        del self.documents[str(frame)]
+        self.doc_tabs.forget(frame)
+        frame.destroy()
+        if not self.documents:
+            self._switch_document(self._add_document())
+        elif self.active_doc is None:
+            self._switch_document(self.documents[self.doc_tabs.select()])
+
     def open_notepad_file(self):
         file_path = filedialog.askopenfilename(title="Open Text File", filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
-        if file_path:
-            try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    content = file.read()
-                self.notepad_text.delete(1.0, tk.END)
-                self.notepad_text.insert(tk.END, content)
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not open file:\n{str(e)}")
+        if not file_path:
+            return
+        for doc in self.documents.values():
+            if doc.path and os.path.abspath(doc.path) == os.path.abspath(file_path):
+                self._switch_document(doc)
+                return
+        try:
+            view = LargeFileView(file_path) if os.path.getsize(file_path) >= LARGE_FILE_THRESHOLD else None
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open file:\n{str(e)}")
+            return
+        # An untouched, empty Untitled document is replaced by the file.
+        current = self.active_doc
+        replace = (current is not None and current.path is None and current.large_file is None
+                   and not current.dirty and self.notepad_text.compare("end-1c", "==", "1.0"))
+        # The new document starts out evicted to its file, so it loads like
+        # any other evicted document.
+        self._switch_document(self._add_document(file_path, view))
+        if replace:
+            self._close_document(current)
+
+    def _on_notepad_io_error(self, error):
+        self.notepad_status.config(text="")
+        messagebox.showerror("Error", f"Could not open or save file:\n{str(error)}")
+
+    def clear_notepad(self):
+        if self.large_file is not None:
+            messagebox.showinfo("Info", "Large files are opened read-only; close the document instead.")
+        else:
+            self.notepad_text.delete(1.0, tk.END)
+
+    def goto_notepad_line(self):
+        line = simpledialog.askinteger("Go to Line", "Line number:", parent=self, minvalue=1)
+        if line is None:
+            return
+        if self.large_file is not None:
+            self._large_file_show(line - 1, cursor_line=line - 1)
+        else:
+            self.notepad_text.mark_set(tk.INSERT, f"{line}.0")
+            self.notepad_text.see(tk.INSERT)
+        self.notepad_text.focus_set()
+
+    # Large-file mode: the Text widget holds only a window of lines around the
+    # visible ones and all scrolling goes through _large_file_show.
+    def _attach_large_file(self, doc):
+        # Large files are read-only, so there is nothing to journal.
+        self._journal_active = False
+        self.notepad_journal.take_pending()
+        self.tasks.submit(self.notepad_journal.discard, lane=self.JOURNAL_LANE)
+        self.notepad_path = None
+        self._reset_search()
+        self.large_file = doc.large_file
+        self._large_window = (0, 0)
+        self.notepad_text.config(wrap="none")
+        self.notepad_text.edit_reset()
+        self.large_file_scrollbar.pack(side="right", fill="y", before=self.notepad_text)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Up>", "<Down>",
+                         "<Prior>", "<Next>", "<Control-Home>", "<Control-End>"):
+            self.notepad_text.bind(sequence, self._on_large_file_key)
+        self._large_file_show(int(doc.yview))
+        if self._large_index_job is not None:
+            self.after_cancel(self._large_index_job)
+        self._poll_large_file_index()
+
+    def _detach_large_file(self):
+        # The view itself stays open with its document until that is closed.
+        if self.large_file is None:
+            return
+        self._reset_search()
+        if self._large_index_job is not None:
+            self.after_cancel(self._large_index_job)
+            self._large_index_job = None
+        self.large_file = None
+        self.large_file_scrollbar.pack_forget()
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Up>", "<Down>",
+                         "<Prior>", "<Next>", "<Control-Home>", "<Control-End>"):
+            self.notepad_text.unbind(sequence)
+        self.notepad_text.config(state="normal", wrap="word")
+        self.notepad_text.delete(1.0, tk.END)
+        self.notepad_status.config(text="")
+
+    def _poll_large_file_index(self):
+        self._large_index_job = None
+        view = self.large_file
+        if view is None:
+            return
+        if view.complete:
+            self.notepad_status.config(text=f"Large file (read-only): {view.line_count:,} lines")
+        else:
+            percent = view.indexed_bytes * 100 // max(view.size, 1)
+            self.notepad_status.config(text=f"Indexing... {percent}% ({view.indexed_lines:,} lines)")
+            self._large_index_job = self.after(200, self._poll_large_file_index)
+        # Refresh the window in case it was cut short by an unfinished index.
+        self._large_file_show(self._large_top)
+
+    def _visible_line_count(self):
+        linespace = tkfont.Font(font=self.notepad_text.cget("font")).metrics("linespace")
+        return max(1, self.notepad_text.winfo_height() // max(linespace, 1))
+
+    def _large_file_show(self, top, cursor_line=None):
+        view = self.large_file
+        visible = self._visible_line_count()
+        total = view.line_count
+        top = max(0, min(top, total - visible))
+        start, stop = self._large_window
+        margin = self.LARGE_FILE_MARGIN
+        if (top < start or (top + visible > stop and stop < total)
+                or (start > 0 and top - start < margin // 2)
+                or (stop < total and stop - (top + visible) < margin // 2)):
+            start = max(0, top - margin)
+            stop = min(total, top + visible + margin)
+            self.notepad_text.config(state="normal")
+            self.notepad_text.delete(1.0, tk.END)
+            self.notepad_text.insert(1.0, view.read_lines(start, stop))
+            self.notepad_text.config(state="disabled")
+            self._large_window = (start, stop)
+            if self._search_matches:
+                self._highlight_search_window()
+        self._large_top = top
+        self.notepad_text.yview(f"{top - start + 1}.0")
+        if cursor_line is not None and start <= cursor_line < stop:
+            self.notepad_text.mark_set(tk.INSERT, f"{cursor_line - start + 1}.0")
+            self.notepad_text.tag_remove("sel", 1.0, tk.END)
+            self.notepad_text.tag_add("sel", f"{cursor_line - start + 1}.0", f"{cursor_line - start + 1}.end")
+        if total:
+            self.large_file_scrollbar.set(top / total, min(1.0, (top + visible) / total))
+
+    def _large_file_scroll(self, action, amount, unit=None):
+        if self.large_file is None:
+            return
+        visible = self._visible_line_count()
+        if action == "moveto":
+            top = int(float(amount) * self.large_file.line_count)
+        elif unit == "pages":
+            top = self._large_top + int(amount) * visible
+        else:
+            top = self._large_top + int(amount)
+        self._large_file_show(top)
+
+    def _on_large_file_key(self, event):
+        visible = self._visible_line_count()
+        steps = {
+            "Up": -1, "Down": 1, "Prior": -visible, "Next": visible,
+            "Home": -self.large_file.line_count, "End": self.large_file.line_count,
+        }
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            step = -3
+        elif event.num == 5 or getattr(event, "delta", 0) < 0:
+            step = 3
+        else:
+            step = steps.get(event.keysym, 0)
+        self._large_file_show(self._large_top + step)
+        return "break"
+
+    def save_notepad_file(self, save_as=False):
+        if self.large_file is not None:
+            messagebox.showinfo("Info", "Large files are opened read-only and cannot be saved from the Notepad.")
+            return
+        if self._doc_loading:
+            return
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+            self._autosave_job = None
+        doc = self.active_doc
+        revision = doc.revision
+
+        def on_saved(_, file_path=None):
+            if file_path is not None:
+                doc.path = file_path
+                if doc is self.active_doc:
+                    self.notepad_path = file_path
+            doc.saved_revision = revision
+            doc.fingerprint = EditJournal.fingerprint(doc.path)
+            if doc is not self.active_doc:
+                self.doc_cache.saved(doc)
+            self._update_doc_tab(doc)
+            messagebox.showinfo("Success", "File saved successfully!")
 
-    def save_notepad_file(self):
+        if self.notepad_path and not save_as:
+            # The worker folds the edits since the last save into the file
+            # atomically. Only if the file changed on disk (a stat, not a
+            # read) is the whole buffer serialized, to be written instead.
+            try:
+                changed = EditJournal.fingerprint(self.notepad_path) != self.notepad_journal.base_fingerprint
+            except OSError:
+                changed = True
+            content = self.notepad_text.get(1.0, "end-1c") if changed else None
+            self.tasks.submit(self.notepad_journal.compact, self.notepad_journal.take_pending(), content,
+                              lane=self.JOURNAL_LANE, group=self.notepad_frame,
+                              on_done=on_saved, on_error=self._on_notepad_io_error)
+            return
         file_path = filedialog.asksaveasfilename(defaultextension=".txt", title="Save Text File", filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
         if file_path:
-            try:
-                content = self.notepad_text.get(1.0, tk.END)
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(content)
-                messagebox.showinfo("Success", "File saved successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not save file:\n{str(e)}")
+            content = self.notepad_text.get(1.0, "end-1c")
+            self.notepad_journal.take_pending()
+
+            self.tasks.submit(self.notepad_journal.save_as, file_path, content, lane=self.JOURNAL_LANE,
+                              group=self.notepad_frame, on_done=lambda _: on_saved(_, file_path),
+                              on_error=self._on_notepad_io_error)
 
     def apply_bold(self):
         try:
@@ -331,22 +1944,43 @@ class ToolboxApp(tk.Tk):
         copy_button = ttk.Button(self.password_frame, text="Copy to Clipboard", command=self.copy_password)
         copy_button.pack(pady=5)
 
+        batch_frame = ttk.Frame(self.password_frame)
+        batch_frame.pack(pady=10)
+        ttk.Label(batch_frame, text="Batch count:").grid(row=0, column=0, padx=5)
+        self.pw_count_var = tk.IntVar(value=1000)
+        tk.Spinbox(batch_frame, from_=1, to=10000000, width=10, textvariable=self.pw_count_var).grid(row=0, column=1, padx=5)
+        ttk.Button(batch_frame, text="Save Batch to File...", command=self.save_password_batch).grid(row=0, column=2, padx=5)
+        ttk.Button(batch_frame, text="Copy Batch to Clipboard", command=self.copy_password_batch).grid(row=0, column=3, padx=5)
+        self.pw_info_label = ttk.Label(self.password_frame, text="")
+        self.pw_info_label.pack(pady=5)
+
+    # Clipboard batches are held in memory by the clipboard itself, so cap them.
+    MAX_CLIPBOARD_PASSWORDS = 100000
+
+    def _password_classes(self):
+        flags = (("upper", self.use_upper), ("lower", self.use_lower), ("digits", self.use_digits), ("symbols", self.use_symbols))
+        return tuple(name for name, var in flags if var.get())
+
+    def _password_options(self):
+        try:
+            length = self.pw_length_var.get()
+            classes = self._password_classes()
+            entropy = password_entropy_bits(length, classes)
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror("Error", str(e) if isinstance(e, ValueError) else "Invalid length!")
+            return None
+        if length < len(classes):
+            messagebox.showerror("Error", f"Length must be at least {len(classes)} to use every character type.")
+            return None
+        return length, classes, entropy
+
     def generate_password(self):
-        length = self.pw_length_var.get()
-        char_pool = ""
-        if self.use_upper.get():
-            char_pool += string.ascii_uppercase
-        if self.use_lower.get():
-            char_pool += string.ascii_lowercase
-        if self.use_digits.get():
-            char_pool += string.digits
-        if self.use_symbols.get():
-            char_pool += string.punctuation
-        if not char_pool:
-            messagebox.showerror("Error", "Select at least one character type!")
-            return
-        password = ''.join(random.choice(char_pool) for _ in range(length))
-        self.generated_password.set(password)
+        options = self._password_options()
+        if options is None:
+            return
+        length, classes, entropy = options
+        self.generated_password.set(next(generate_passwords(1, length, classes)))
+        self.pw_info_label.config(text=f"Entropy: {entropy:.1f} bits")
 
     def copy_password(self):
         password = self.generated_password.get()
@@ -357,13 +1991,66 @@ class ToolboxApp(tk.Tk):
         else:
             messagebox.showwarning("Warning", "No password to copy!")
 
+    def _password_batch_count(self):
+        try:
+            count = self.pw_count_var.get()
+        except tk.TclError:
+            count = 0
+        if count < 1:
+            messagebox.showerror("Error", "Invalid batch count!")
+            return None
+        return count
+
+    def save_password_batch(self):
+        options = self._password_options()
+        count = self._password_batch_count() if options else None
+        if count is None:
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt", title="Save Passwords", filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+        if not file_path:
+            return
+        length, classes, _ = options
+
+        def worker():
+            with open(file_path, "w", encoding="ascii", newline="\n") as file:
+                return write_passwords(file, count, length, classes)
+
+        def on_error(error):
+            self.pw_info_label.config(text="")
+            messagebox.showerror("Error", f"Could not save passwords:\n{str(error)}")
+
+        self.pw_info_label.config(text=f"Generating {count:,} passwords...")
+        self.tasks.submit(worker, group=self.password_frame, on_done=self._show_password_summary, on_error=on_error)
+
+    def copy_password_batch(self):
+        options = self._password_options()
+        count = self._password_batch_count() if options else None
+        if count is None:
+            return
+        if count > self.MAX_CLIPBOARD_PASSWORDS:
+            messagebox.showerror("Error", f"Use 'Save Batch to File' for more than {self.MAX_CLIPBOARD_PASSWORDS:,} passwords.")
+            return
+        length, classes, _ = options
+        self.clipboard_clear()
+
+        class ClipboardWriter:
+            write = self.clipboard_append
+
+        self._show_password_summary(write_passwords(ClipboardWriter(), count, length, classes))
+
+    def _show_password_summary(self, summary):
+        self.pw_info_label.config(
+            text=f"{summary['count']:,} passwords, {summary['entropy_bits']:.1f} bits each, "
+                 f"{summary['rate']:,.0f} passwords/sec"
+        )
+
     # ---------------------- UNIT CONVERTER FUNCTIONS ---------------------- #
     def _build_unit_converter_ui(self):
         tk.Label(self.unit_converter_frame, text="Unit Converter", font=("Helvetica", 16)).pack(pady=10)
         type_frame = ttk.Frame(self.unit_converter_frame)
         type_frame.pack(pady=5)
         ttk.Label(type_frame, text="Conversion Type:").pack(side="left", padx=5)
-        self.conversion_types = ["Temperature", "Length", "Weight"]
+        self.conversion_types = list(UNIT_REGISTRY)
         self.conversion_type = tk.StringVar()
         self.conversion_type.set(self.conversion_types[0])
         self.type_combo = ttk.Combobox(type_frame, textvariable=self.conversion_type, values=self.conversion_types, state="readonly")
@@ -391,15 +2078,7 @@ class ToolboxApp(tk.Tk):
         self.update_unit_options()
 
     def update_unit_options(self, event=None):
-        conversion_type = self.conversion_type.get()
-        if conversion_type == "Temperature":
-            units = ["Celsius", "Fahrenheit"]
-        elif conversion_type == "Length":
-            units = ["Meters", "Feet"]
-        elif conversion_type == "Weight":
-            units = ["Kilograms", "Pounds"]
-        else:
-            units = []
+        units = list(UNIT_REGISTRY.get(self.conversion_type.get(), ()))
         self.from_combo['values'] = units
         self.to_combo['values'] = units
         if units:
@@ -412,34 +2091,16 @@ class ToolboxApp(tk.Tk):
         except ValueError:
             messagebox.showerror("Error", "Invalid input value!")
             return
-        from_u = self.from_unit.get()
-        to_u = self.to_unit.get()
-        conversion_type = self.conversion_type.get()
-        result = value
-        if conversion_type == "Temperature":
-            if from_u == to_u:
-                result = value
-            elif from_u == "Celsius" and to_u == "Fahrenheit":
-                result = value * 9/5 + 32
-            elif from_u == "Fahrenheit" and to_u == "Celsius":
-                result = (value - 32) * 5/9
-        elif conversion_type == "Length":
-            if from_u == to_u:
-                result = value
-            elif from_u == "Meters" and to_u == "Feet":
-                result = value * 3.28084
-            elif from_u == "Feet" and to_u == "Meters":
-                result = value / 3.28084
-        elif conversion_type == "Weight":
-            if from_u == to_u:
-                result = value
-            elif from_u == "Kilograms" and to_u == "Pounds":
-                result = value * 2.20462
-            elif from_u == "Pounds" and to_u == "Kilograms":
-                result = value / 2.20462
-        self.unit_result_label.config(text=f"Result: {result:.2f}")
+        try:
+            result = convert_unit(value, self.from_unit.get(), self.to_unit.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.unit_result_label.config(text=f"Result: {result:.10g}")
 
     # ---------------------- CURRENCY CONVERTER FUNCTIONS ---------------------- #
+    CURRENCY_TIMEOUT_S = 30
+
     def _build_currency_converter_ui(self):
         tk.Label(self.currency_converter_frame, text="Currency Converter", font=("Helvetica", 16)).pack(pady=10)
         amount_frame = ttk.Frame(self.currency_converter_frame)
@@ -463,8 +2124,17 @@ class ToolboxApp(tk.Tk):
         self.to_currency.set("EUR")
         convert_button = ttk.Button(self.currency_converter_frame, text="Convert", command=self.convert_currency)
         convert_button.pack(pady=5)
+        batch_button = ttk.Button(self.currency_converter_frame, text="Batch Convert CSV...", command=self.convert_currency_batch)
+        batch_button.pack(pady=5)
         self.currency_result_label = ttk.Label(self.currency_converter_frame, text="Result: ", font=("Helvetica", 14))
         self.currency_result_label.pack(pady=5)
+        self.currency_source_label = ttk.Label(self.currency_converter_frame, text="")
+        self.currency_source_label.pack(pady=2)
+        self.rate_cache = ExchangeRateCache(
+            ttl=int(os.environ.get("TOOLBOX_RATES_TTL", 3600)),
+            url=os.environ.get("TOOLBOX_RATES_URL", ExchangeRateCache.DEFAULT_URL),
+        )
+        self._currency_task = None
 
     def convert_currency(self):
         try:
@@ -474,27 +2144,80 @@ class ToolboxApp(tk.Tk):
             return
         from_curr = self.from_currency.get()
         to_curr = self.to_currency.get()
-        url = f"https://api.exchangerate.host/convert?from={from_curr}&to={to_curr}&amount={amount}"
-        try:
-            response = requests.get(url)
-            data = response.json()
-            if data.get('success', True):
-                result = data.get('result', None)
-                if result is not None:
-                    self.currency_result_label.config(text=f"Result: {result:.2f} {to_curr}")
-                else:
-                    messagebox.showerror("Error", "Conversion failed! Possible reasons: API not found, no internet.")
-            else:
-                messagebox.showerror("Error", "Conversion failed! Possible reasons: API not found, no internet.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to retrieve conversion rate: {str(e)}")
+        # A newer click supersedes a request that is still waiting on the network.
+        if self._currency_task is not None:
+            self._currency_task.cancel()
+        self.currency_result_label.config(text="Result: ...")
+        self._currency_task = self.tasks.submit(
+            self.rate_cache.convert, amount, from_curr, to_curr,
+            group=self.currency_converter_frame, timeout=self.CURRENCY_TIMEOUT_S,
+            on_done=lambda result: self._show_currency_result(result, to_curr),
+            on_error=self._on_currency_error,
+        )
+
+    def _show_currency_result(self, result, to_curr):
+        self._currency_task = None
+        self.currency_result_label.config(text=f"Result: {result:.2f} {to_curr}")
+        fetched = datetime.datetime.fromtimestamp(self.rate_cache.fetched_at).strftime('%Y-%m-%d %H:%M')
+        if self.rate_cache.source == "snapshot":
+            self.currency_source_label.config(text=f"Offline: using rates from {fetched}")
+        else:
+            self.currency_source_label.config(text=f"Rates as of {fetched}")
+
+    def _on_currency_error(self, error):
+        self._currency_task = None
+        self.currency_result_label.config(text="Result: ")
+        messagebox.showerror("Error", f"Failed to retrieve conversion rate: {str(error)}\nPossible reasons: API not found, no internet.")
+
+    def convert_currency_batch(self):
+        src_path = filedialog.askopenfilename(title="Open CSV of Amounts", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
+        if not src_path:
+            return
+        dst_path = filedialog.asksaveasfilename(defaultextension=".csv", title="Save Converted CSV", filetypes=[("CSV Files", "*.csv")])
+        if not dst_path:
+            return
+        from_curr = self.from_currency.get()
+        to_curr = self.to_currency.get()
+
+        def worker():
+            return convert_currency_csv(src_path, dst_path, self.rate_cache.get_rates(), from_curr, to_curr)
+
+        def on_done(summary):
+            messagebox.showinfo(
+                "Batch Complete",
+                f"Converted {summary['rows'] - summary['skipped']:,} of {summary['rows']:,} rows "
+                f"in {summary['seconds']:.2f} s ({summary['rows_per_sec']:,.0f} rows/sec).",
+            )
+
+        self.tasks.submit(worker, group=self.currency_converter_frame, on_done=on_done,
+                          on_error=lambda e: messagebox.showerror("Error", f"Batch conversion failed:\n{str(e)}"))
 
     # ---------------------- QR CODE GENERATOR FUNCTIONS ---------------------- #
+    # Largest preview edge in pixels; bigger codes are shown at fewer pixels per module.
+    QR_PREVIEW_SIZE = 320
+    QR_LIVE_DELAY_MS = 300
+
     def _build_qr_generator_ui(self):
         instruction = ttk.Label(self.qr_generator_frame, text="Enter text or URL for QR Code:", font=("Helvetica", 14))
         instruction.pack(pady=10)
         self.qr_input = ttk.Entry(self.qr_generator_frame, font=("Helvetica", 12))
         self.qr_input.pack(pady=5, fill="x", padx=20)
+        self.qr_input.bind("<KeyRelease>", self._on_qr_input_changed)
+
+        options_frame = ttk.Frame(self.qr_generator_frame)
+        options_frame.pack(pady=5)
+        ttk.Label(options_frame, text="Error correction:").grid(row=0, column=0, padx=5)
+        self.qr_error_level = tk.StringVar(value="M")
+        ttk.Combobox(options_frame, textvariable=self.qr_error_level, values=QR_ERROR_LEVELS, width=3, state="readonly").grid(row=0, column=1, padx=5)
+        ttk.Label(options_frame, text="Version:").grid(row=0, column=2, padx=5)
+        self.qr_version = tk.StringVar(value="Auto")
+        ttk.Combobox(options_frame, textvariable=self.qr_version, values=["Auto"] + [str(v) for v in range(1, 41)], width=5, state="readonly").grid(row=0, column=3, padx=5)
+        ttk.Label(options_frame, text="Box size:").grid(row=0, column=4, padx=5)
+        self.qr_box_size = tk.IntVar(value=10)
+        ttk.Spinbox(options_frame, from_=1, to=50, width=4, textvariable=self.qr_box_size).grid(row=0, column=5, padx=5)
+        self.qr_live_preview = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Live preview", variable=self.qr_live_preview).grid(row=0, column=6, padx=5)
+
         generate_btn = ttk.Button(self.qr_generator_frame, text="Generate QR Code", command=self.generate_qr)
         generate_btn.pack(pady=10)
         self.qr_label = ttk.Label(self.qr_generator_frame)
@@ -502,24 +2225,151 @@ class ToolboxApp(tk.Tk):
         save_btn = ttk.Button(self.qr_generator_frame, text="Save QR Code", command=self.save_qr)
         save_btn.pack(pady=5)
 
+        batch_frame = ttk.Frame(self.qr_generator_frame)
+        batch_frame.pack(pady=10)
+        ttk.Label(batch_frame, text="Batch format:").grid(row=0, column=0, padx=5)
+        self.qr_batch_format = tk.StringVar(value="PNG")
+        ttk.Combobox(batch_frame, textvariable=self.qr_batch_format, values=["PNG", "SVG"], width=5, state="readonly").grid(row=0, column=1, padx=5)
+        ttk.Label(batch_frame, text="Output:").grid(row=0, column=2, padx=5)
+        self.qr_batch_output = tk.StringVar(value="ZIP archive")
+        ttk.Combobox(batch_frame, textvariable=self.qr_batch_output, values=["ZIP archive", "Folder"], width=11, state="readonly").grid(row=0, column=3, padx=5)
+        self.qr_batch_button = ttk.Button(batch_frame, text="Batch from File...", command=self.generate_qr_batch)
+        self.qr_batch_button.grid(row=0, column=4, padx=5)
+        self.qr_cancel_button = ttk.Button(batch_frame, text="Cancel", command=self.cancel_qr_batch, state="disabled")
+        self.qr_cancel_button.grid(row=0, column=5, padx=5)
+        self.qr_batch_progress = ttk.Progressbar(self.qr_generator_frame, length=400, mode="determinate")
+        self.qr_batch_progress.pack(pady=5)
+        self.qr_batch_status = ttk.Label(self.qr_generator_frame, text="")
+        self.qr_batch_status.pack(pady=2)
+        self._qr_batch_task = None
+
+        self.qr_cache = QRMatrixCache()
+        self.qr_matrix = None
+        self._qr_live_job = None
+        self._qr_render_generation = 0
+
+    def _qr_settings(self):
+        version = self.qr_version.get()
+        return self.qr_error_level.get(), None if version == "Auto" else int(version)
+
     def generate_qr(self):
         data = self.qr_input.get()
         if not data:
             messagebox.showerror("Error", "Please enter text or URL for QR Code.")
             return
+        self._render_qr(data, lambda e: messagebox.showerror("Error", f"Error generating QR Code: {str(e)}"))
+
+    def _render_qr(self, data, on_error):
+        """Show the code for `data`, rendering it in a worker process on a cache miss."""
+        settings = self._qr_settings()
+        matrix = self.qr_cache.peek(data, *settings)
+        if matrix is not None:
+            self._show_qr_matrix(matrix)
+            return
+        # Only the newest request may replace the preview.
+        self._qr_render_generation += 1
+        generation = self._qr_render_generation
+
+        def on_done(matrix):
+            self.qr_cache.put(matrix, data, *settings)
+            if generation == self._qr_render_generation:
+                self._show_qr_matrix(matrix)
+
+        self.tasks.submit(render_qr_matrix, data, *settings, process=True, group=self.qr_generator_frame,
+                          on_done=on_done, on_error=on_error)
+
+    def _show_qr_matrix(self, matrix):
+        ImageTk = _import_heavy("PIL.ImageTk")
+        # Whole pixels per module keep the modules crisp without resampling.
+        scale = max(1, self.QR_PREVIEW_SIZE // matrix[0])
+        self.qr_matrix = matrix
+        self.tk_qr_image = ImageTk.PhotoImage(qr_matrix_image(matrix, scale))
+        self.qr_label.config(image=self.tk_qr_image)
+
+    def _on_qr_input_changed(self, event=None):
+        if not self.qr_live_preview.get():
+            return
+        if self._qr_live_job is not None:
+            self.after_cancel(self._qr_live_job)
+        self._qr_live_job = self.after(self.QR_LIVE_DELAY_MS, self._render_qr_live)
+
+    def _render_qr_live(self):
+        self._qr_live_job = None
+        data = self.qr_input.get()
+        if data:
+            # Keep the last good preview when the data does not fit the chosen version.
+            self._render_qr(data, on_error=lambda e: None)
+
+    def generate_qr_batch(self):
+        src_path = filedialog.askopenfilename(title="Open CSV or Text File", filetypes=[("CSV/Text Files", "*.csv *.txt"), ("All Files", "*.*")])
+        if not src_path:
+            return
+        if self.qr_batch_output.get() == "Folder":
+            output_path = filedialog.askdirectory(title="Choose Output Folder")
+        else:
+            output_path = filedialog.asksaveasfilename(defaultextension=".zip", title="Save QR Codes", filetypes=[("ZIP Archives", "*.zip")])
+        if not output_path:
+            return
+        fmt = self.qr_batch_format.get().lower()
+        error_correction = self.qr_error_level.get()
         try:
-            self.qr_image = qrcode.make(data)
-            self.tk_qr_image = ImageTk.PhotoImage(self.qr_image)
-            self.qr_label.config(image=self.tk_qr_image)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error generating QR Code: {str(e)}")
+            box_size = self.qr_box_size.get()
+        except tk.TclError:
+            box_size = 10
+        started = time.perf_counter()
+
+        def worker(task):
+            # Counting lines reads the whole file, so it happens here rather than on the UI thread.
+            with open(src_path, "rb") as file:
+                total = sum(1 for _ in file)
+            task.report(0, 0, total)
+            return generate_qr_batch(src_path, output_path, fmt, error_correction, box_size,
+                                     progress=lambda done, failed: task.report(done, failed, total),
+                                     cancel=task.cancel_event)
+
+        def on_progress(done, failed, total):
+            self.qr_batch_progress.config(maximum=max(total, 1), value=done)
+            elapsed = time.perf_counter() - started
+            self.qr_batch_status.config(text=f"{done:,} codes ({failed:,} failed), {done / max(elapsed, 1e-9):,.0f} codes/sec")
+
+        self.qr_batch_button.config(state="disabled")
+        self.qr_cancel_button.config(state="normal")
+        self.qr_batch_progress.config(value=0)
+        self.qr_batch_status.config(text="Starting worker processes...")
+        self._qr_batch_task = self.tasks.submit(worker, pass_task=True, group=self.qr_generator_frame,
+                                                on_progress=on_progress, on_done=self._on_qr_batch_done,
+                                                on_error=self._on_qr_batch_error)
+
+    def cancel_qr_batch(self):
+        # Cooperative: the batch stops at its next check and still reports what it wrote.
+        if self._qr_batch_task is not None:
+            self._qr_batch_task.cancel_event.set()
+            self.qr_batch_status.config(text="Cancelling...")
+
+    def _finish_qr_batch(self):
+        self._qr_batch_task = None
+        self.qr_batch_button.config(state="normal")
+        self.qr_cancel_button.config(state="disabled")
+
+    def _on_qr_batch_error(self, error):
+        self._finish_qr_batch()
+        self.qr_batch_status.config(text="")
+        messagebox.showerror("Error", f"Batch generation failed:\n{str(error)}")
+
+    def _on_qr_batch_done(self, summary):
+        self._finish_qr_batch()
+        state = "Cancelled" if summary["cancelled"] else "Done"
+        self.qr_batch_status.config(
+            text=f"{state}: {summary['count']:,} codes ({summary['failed']:,} failed) in "
+                 f"{summary['seconds']:.1f} s, {summary['rate']:,.0f} codes/sec"
+        )
 
     def save_qr(self):
-        if hasattr(self, 'qr_image'):
+        if self.qr_matrix is not None:
             file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG Files", "*.png")])
             if file_path:
                 try:
-                    self.qr_image.save(file_path)
+                    qr_matrix_image(self.qr_matrix, self.qr_box_size.get()).convert("1").save(file_path)
                     messagebox.showinfo("Saved", "QR Code saved successfully!")
                 except Exception as e:
                     messagebox.showerror("Error", f"Error saving QR Code: {str(e)}")
@@ -527,6 +2377,16 @@ class ToolboxApp(tk.Tk):
             messagebox.showerror("Error", "No QR Code generated to save.")
 
     # ---------------------- ALARM FUNCTIONS ---------------------- #
+    # The alarm store and its scheduler start with the app, not with the tab,
+    # so alarms fire even if the Alarm tab is never opened.
+    SNOOZE_MINUTES = 5
+
+    def _start_alarm_scheduler(self):
+        self.alarm_store = AlarmStore()
+        self._alarm_sound_stops = set()  # stop events of sounds still playing or queued
+        self.refresh_scheduler.register("alarm", self._alarm_tick, rate=1, background=True,
+                                        visible=lambda: self._tab_visible(self.alarm_frame))
+
     def _build_alarm_ui(self):
         tk.Label(self.alarm_frame, text="Set Alarm", font=("Helvetica", 16)).pack(pady=10)
         time_frame = ttk.Frame(self.alarm_frame)
@@ -540,32 +2400,110 @@ class ToolboxApp(tk.Tk):
         ttk.Spinbox(time_frame, from_=0, to=23, width=5, textvariable=self.alarm_hour).grid(row=0, column=1, padx=5, pady=2)
         ttk.Spinbox(time_frame, from_=0, to=59, width=5, textvariable=self.alarm_minute).grid(row=0, column=3, padx=5, pady=2)
         ttk.Spinbox(time_frame, from_=0, to=59, width=5, textvariable=self.alarm_second).grid(row=0, column=5, padx=5, pady=2)
+        ttk.Label(time_frame, text="Repeat:").grid(row=1, column=0, padx=5, pady=2)
+        self.alarm_repeat = tk.StringVar(value="once")
+        ttk.Combobox(time_frame, textvariable=self.alarm_repeat, values=ALARM_REPEATS, width=9, state="readonly").grid(row=1, column=1, columnspan=2, padx=5, pady=2)
+        ttk.Label(time_frame, text="Label:").grid(row=1, column=3, padx=5, pady=2)
+        self.alarm_label_var = tk.StringVar()
+        ttk.Entry(time_frame, width=15, textvariable=self.alarm_label_var).grid(row=1, column=4, columnspan=2, padx=5, pady=2)
         set_button = ttk.Button(self.alarm_frame, text="Set Alarm", command=self.set_alarm)
         set_button.pack(pady=10)
         self.alarm_status_label = ttk.Label(self.alarm_frame, text="No alarm set", font=("Helvetica", 12))
         self.alarm_status_label.pack(pady=5)
 
+        self.alarm_tree = ttk.Treeview(self.alarm_frame, columns=("time", "repeat", "next"), height=6)
+        self.alarm_tree.heading("#0", text="Label")
+        self.alarm_tree.heading("time", text="Time")
+        self.alarm_tree.heading("repeat", text="Repeat")
+        self.alarm_tree.heading("next", text="Next")
+        self.alarm_tree.pack(pady=5, fill="both", expand=True, padx=20)
+        list_buttons = ttk.Frame(self.alarm_frame)
+        list_buttons.pack(pady=5)
+        ttk.Button(list_buttons, text="Cancel Alarm", command=self.cancel_alarm).grid(row=0, column=0, padx=5)
+        ttk.Button(list_buttons, text=f"Snooze {self.SNOOZE_MINUTES} min", command=self.snooze_alarm).grid(row=0, column=1, padx=5)
+        self._refresh_alarm_list()
+
     def set_alarm(self):
         try:
             h = self.alarm_hour.get()
             m = self.alarm_minute.get()
             s = self.alarm_second.get()
+            alarm = self.alarm_store.add(h, m, s, self.alarm_repeat.get(), self.alarm_label_var.get().strip())
         except Exception:
             messagebox.showerror("Error", "Invalid alarm time!")
             return
-        now = datetime.datetime.now()
-        target_time = datetime.datetime.combine(now.date(), datetime.time(h, m, s))
-        if target_time <= now:
-            target_time += datetime.timedelta(days=1)
-        delay = (target_time - now).total_seconds()
+        target_time = datetime.datetime.fromtimestamp(alarm.next_at)
         self.alarm_status_label.config(text=f"Alarm set for: {target_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        self.after(int(delay * 1000), self.alarm_trigger)
+        self.refresh_scheduler.wake("alarm")
+
+    def _selected_alarm_ids(self):
+        return [int(item) for item in self.alarm_tree.selection()]
+
+    def cancel_alarm(self):
+        for alarm_id in self._selected_alarm_ids():
+            self.alarm_store.cancel(alarm_id)
+        self.refresh_scheduler.wake("alarm")
+
+    def snooze_alarm(self, alarm_ids=None):
+        for alarm_id in self._selected_alarm_ids() if alarm_ids is None else alarm_ids:
+            self.alarm_store.snooze(alarm_id, self.SNOOZE_MINUTES)
+        self.refresh_scheduler.wake("alarm")
+
+    def _alarm_tick(self, visible):
+        for alarm in self.alarm_store.pop_due():
+            self.alarm_trigger(alarm)
+        if visible:
+            self._refresh_alarm_list()
+        # Sleep until the next alarm, but never longer than MAX_SLEEP so a
+        # wall-clock change is noticed on the next wake.
+        due = self.alarm_store.next_due()
+        return AlarmStore.MAX_SLEEP if due is None else min(AlarmStore.MAX_SLEEP, max(0.0, due - time.time()))
+
+    def _refresh_alarm_list(self):
+        if not hasattr(self, "alarm_tree"):
+            return  # the Alarm tab has not been built yet
+        self.alarm_tree.delete(*self.alarm_tree.get_children())
+        for alarm in sorted(self.alarm_store.alarms.values(), key=lambda a: a.due_at() or float("inf")):
+            due = alarm.due_at()
+            next_text = datetime.datetime.fromtimestamp(due).strftime("%Y-%m-%d %H:%M:%S") if due else "Done"
+            self.alarm_tree.insert("", tk.END, iid=str(alarm.id), text=alarm.label or f"Alarm {alarm.id}",
+                                   values=(f"{alarm.hour:02d}:{alarm.minute:02d}:{alarm.second:02d}", alarm.repeat, next_text))
+
+    def alarm_trigger(self, alarm):
+        # The tone plays on a worker thread; the alert window is not modal.
+        stop = threading.Event()
+        self._alarm_sound_stops.add(stop)
+        self.tasks.submit(play_alarm_sound, stop, lane="alarm-sound",
+                          on_done=lambda _: self._alarm_sound_stops.discard(stop),
+                          on_error=lambda _: self._alarm_sound_stops.discard(stop))
+        alert = tk.Toplevel(self)
+        alert.title("Alarm")
+        alert.attributes("-topmost", True)
+        message = alarm.label or "Alarm time reached!"
+        ttk.Label(alert, text=message, font=("Helvetica", 14)).pack(padx=20, pady=15)
+        buttons = ttk.Frame(alert)
+        buttons.pack(pady=10)
+
+        def close(snooze):
+            # Silence every alarm sound, including ones queued behind this one.
+            for event in self._alarm_sound_stops:
+                event.set()
+            self._alarm_sound_stops.discard(stop)
+            alert.destroy()
+            if snooze:
+                self.snooze_alarm([alarm.id])
 
-    def alarm_trigger(self):
-        for i in range(8):
-            winsound.Beep(1000, 500)  # Frequency: 1000 Hz, Duration: 500 ms
-    messagebox.showinfo("Alarm", "Alarm time reached!")
+        ttk.Button(buttons, text=f"Snooze {self.SNOOZE_MINUTES} min", command=lambda: close(True)).grid(row=0, column=0, padx=5)
+        ttk.Button(buttons, text="Dismiss", command=lambda: close(False)).grid(row=0, column=1, padx=5)
+        alert.protocol("WM_DELETE_WINDOW", lambda: close(False))
 
 if __name__ == "__main__":
+    # --profile records callback timings from startup; F12 shows them.
+    PROFILER.enabled = "--profile" in sys.argv[1:]
     app = ToolboxApp()
+    if "--timings" in sys.argv[1:]:
+        # Print once the first frame has painted, and again on exit so lazily
+        # built tabs and imports show up too.
+        app.after(500, lambda: print(app.startup_report()))
+        app.protocol("WM_DELETE_WINDOW", lambda: (print(app.startup_report()), app.destroy()))
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Headless core of Toolbox: every tool's logic, importable without tkinter.
+
+The submodules are not imported here so that `import toolbox_core.calc`
+(and the CLI) only pays for the tool it uses.
+"""
+import importlib
+import os
+import sys
+import time
+
+# Heavy third-party modules (requests, qrcode, PIL, numpy) are imported on
+# first use through _import_heavy so they don't slow down startup.
+_import_timings = {}
+
+
+def _import_heavy(module_name):
+    """Import a module the first time a tool needs it and record the import time."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        _import_timings[module_name] = time.perf_counter() - start
+    return module
+
+
+# Per-user data directory for caches and snapshots.
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".toolbox")
+
+
+def _write_atomic(path, content):
+    """Write `content` to a temp file next to `path`, fsync it and rename it over `path`."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def _cell(row, col):
+    """Stripped CSV cell `col` of `row`, or "" when the column is missing."""
+    return row[col].strip() if col is not None and col < len(row) else ""
+
+
+def _to_float(text):
+    """float(text), or NaN when the cell is not a number."""
+    try:
+        return float(text)
+    except ValueError:
+        return float("nan")
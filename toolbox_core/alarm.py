@@ -0,0 +1,209 @@
+"""Persistent alarms and the alarm tone."""
+import heapq
+import importlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import datetime
+import wave
+import time
+from array import array
+
+from toolbox_core import DATA_DIR, _write_atomic
+
+
+# ---------------------- ALARMS ---------------------- #
+ALARM_REPEATS = ("once", "daily", "weekdays")
+
+
+class Alarm:
+    __slots__ = ("id", "hour", "minute", "second", "repeat", "label", "next_at", "snooze_at", "version")
+
+    def __init__(self, alarm_id, hour, minute, second, repeat="once", label="", next_at=None, snooze_at=None):
+        if repeat not in ALARM_REPEATS:
+            raise ValueError(f"Unknown repeat mode: {repeat}")
+        datetime.time(hour, minute, second)  # validates the ranges
+        self.id = alarm_id
+        self.hour = hour
+        self.minute = minute
+        self.second = second
+        self.repeat = repeat
+        self.label = label
+        self.next_at = next_at  # wall-clock timestamps
+        self.snooze_at = snooze_at
+        self.version = 0
+
+    def due_at(self):
+        times = [t for t in (self.next_at, self.snooze_at) if t is not None]
+        return min(times) if times else None
+
+    def occurrence_after(self, moment):
+        """First datetime strictly after `moment` that matches this alarm's time and repeat rule."""
+        candidate = datetime.datetime.combine(moment.date(), datetime.time(self.hour, self.minute, self.second))
+        if candidate <= moment:
+            candidate += datetime.timedelta(days=1)
+        if self.repeat == "weekdays":
+            while candidate.weekday() >= 5:
+                candidate += datetime.timedelta(days=1)
+        return candidate
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "version"}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data["hour"], data["minute"], data["second"], data.get("repeat", "once"),
+                   data.get("label", ""), data.get("next_at"), data.get("snooze_at"))
+
+
+class AlarmStore:
+    """Alarms persisted to a JSON file and served from a heap of due times.
+
+    Due times are wall-clock timestamps, so alarms survive restarts; the host
+    should wake at least every MAX_SLEEP seconds and call pop_due(), which
+    re-reads the clock each time and therefore copes with clock changes.
+    Alarms missed while the app was closed fire on the first pop_due().
+    """
+
+    MAX_SLEEP = 30.0
+
+    def __init__(self, path=None, now=datetime.datetime.now):
+        self.path = path or os.path.join(DATA_DIR, "alarms.json")
+        self.now = now
+        self.alarms = {}
+        self._heap = []
+        self._next_id = 1
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                records = json.load(file)
+        except (OSError, ValueError):
+            return
+        for record in records:
+            try:
+                alarm = Alarm.from_dict(record)
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.alarms[alarm.id] = alarm
+            self._push(alarm)
+        self._next_id = max(self.alarms, default=0) + 1
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            _write_atomic(self.path, json.dumps([alarm.to_dict() for alarm in self.alarms.values()], indent=1))
+        except OSError:
+            pass
+
+    def _push(self, alarm):
+        alarm.version += 1
+        due = alarm.due_at()
+        if due is not None:
+            heapq.heappush(self._heap, (due, alarm.id, alarm.version))
+
+    def _is_live(self, entry):
+        alarm = self.alarms.get(entry[1])
+        return alarm is not None and alarm.version == entry[2]
+
+    def add(self, hour, minute, second, repeat="once", label=""):
+        alarm = Alarm(self._next_id, hour, minute, second, repeat, label)
+        alarm.next_at = alarm.occurrence_after(self.now()).timestamp()
+        self._next_id += 1
+        self.alarms[alarm.id] = alarm
+        self._push(alarm)
+        self.save()
+        return alarm
+
+    def cancel(self, alarm_id):
+        if self.alarms.pop(alarm_id, None) is not None:
+            self.save()
+
+    def snooze(self, alarm_id, minutes=5):
+        alarm = self.alarms.get(alarm_id)
+        if alarm is not None:
+            alarm.snooze_at = (self.now() + datetime.timedelta(minutes=minutes)).timestamp()
+            self._push(alarm)
+            self.save()
+
+    def next_due(self):
+        """Timestamp of the earliest pending alarm, or None."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self):
+        """Return the alarms due now and move each to its next occurrence."""
+        now = self.now()
+        now_ts = now.timestamp()
+        fired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ts:
+            entry = heapq.heappop(heap)
+            if not self._is_live(entry):
+                continue
+            alarm = self.alarms[entry[1]]
+            if alarm.snooze_at is not None and alarm.snooze_at <= now_ts:
+                alarm.snooze_at = None
+            if alarm.next_at is not None and alarm.next_at <= now_ts:
+                # Recurring alarms skip any occurrences missed while closed.
+                alarm.next_at = None if alarm.repeat == "once" else alarm.occurrence_after(now).timestamp()
+            self._push(alarm)
+            fired.append(alarm)
+        if fired:
+            self.save()
+        return fired
+
+
+def _alarm_tone_path(frequency, duration_ms, beeps):
+    # A WAV of the same beeps winsound plays, for players on other platforms.
+    path = os.path.join(tempfile.gettempdir(), f"toolbox_alarm_{frequency}_{duration_ms}_{beeps}.wav")
+    if not os.path.exists(path):
+        rate = 16000
+        tone = array("h", (int(12000 * math.sin(2 * math.pi * frequency * i / rate))
+                           for i in range(rate * duration_ms // 1000)))
+        gap = array("h", bytes(2 * rate // 20))
+        with wave.open(path, "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(rate)
+            for _ in range(beeps):
+                file.writeframes(tone.tobytes() + gap.tobytes())
+    return path
+
+
+def play_alarm_sound(stop=None, beeps=8, frequency=1000, duration_ms=500):
+    """Play the alarm tone, blocking until done or until `stop` is set.
+
+    Uses winsound on Windows. Elsewhere it plays a generated WAV through
+    paplay, aplay or afplay, falling back to the terminal bell.
+    """
+    if sys.platform == "win32":
+        winsound = importlib.import_module("winsound")
+        for _ in range(beeps):
+            if stop is not None and stop.is_set():
+                return
+            winsound.Beep(frequency, duration_ms)
+        return
+    for player in ("paplay", "aplay", "afplay"):
+        executable = shutil.which(player)
+        if executable:
+            process = subprocess.Popen([executable, _alarm_tone_path(frequency, duration_ms, beeps)],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            while process.poll() is None:
+                if stop is not None and stop.wait(0.1):
+                    process.terminate()
+                    return
+            return
+    for _ in range(beeps):
+        if stop is not None and stop.is_set():
+            return
+        sys.stdout.write("\a")
+        sys.stdout.flush()
+        time.sleep(duration_ms / 1000)
@@ -0,0 +1,240 @@
+"""Safe arithmetic expression evaluation, for single values and CSV columns."""
+import ast
+import csv
+import functools
+import io
+import itertools
+import keyword
+import math
+import re
+import time
+import tokenize
+
+from toolbox_core import _cell, _import_heavy, _to_float
+
+
+# ---------------------- EXPRESSION ENGINE ---------------------- #
+class ExpressionError(ValueError):
+    """Raised when a calculator expression is malformed or uses something not allowed."""
+
+
+_MAX_POW_BITS = 100000
+_MAX_FACTORIAL = 5000
+
+
+def _safe_pow(base, exponent):
+    # Refuse integer powers whose result would take seconds to compute.
+    if isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1 \
+            and base.bit_length() * exponent > _MAX_POW_BITS:
+        raise ExpressionError("Exponent too large")
+    return base ** exponent
+
+
+def _safe_factorial(n):
+    if n > _MAX_FACTORIAL:
+        raise ExpressionError("Argument too large for factorial")
+    return math.factorial(n)
+
+
+CALC_NAMESPACE = {
+    "pi": math.pi, "e": math.e, "tau": math.tau,
+    "sqrt": math.sqrt, "exp": math.exp, "log": math.log, "log10": math.log10, "log2": math.log2,
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "sinh": math.sinh, "cosh": math.cosh, "tanh": math.tanh,
+    "degrees": math.degrees, "radians": math.radians, "hypot": math.hypot,
+    "floor": math.floor, "ceil": math.ceil, "abs": abs, "round": round,
+    "factorial": _safe_factorial,
+}
+_CALC_GLOBALS = {"__builtins__": {}, "_pow": _safe_pow, **CALC_NAMESPACE}
+
+_CALC_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_CALC_UNARYOPS = (ast.UAdd, ast.USub)
+_CALC_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call) \
+    + _CALC_BINOPS + _CALC_UNARYOPS
+
+
+def _caret_to_pow(expression):
+    # `^` means power on a calculator. Swapping the token (not the AST node)
+    # gives it the precedence and right-associativity of `**`.
+    try:
+        tokens = [(token.type, "**" if token.type == tokenize.OP and token.string == "^" else token.string)
+                  for token in tokenize.generate_tokens(io.StringIO(expression).readline)]
+    except (tokenize.TokenError, SyntaxError):
+        raise ExpressionError("Invalid expression") from None
+    return tokenize.untokenize(tokens)
+
+
+def _rewrite_pow(node):
+    # Every power goes through _safe_pow.
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        func = ast.copy_location(ast.Name(id="_pow", ctx=ast.Load()), node)
+        return ast.copy_location(ast.Call(func=func, args=[node.left, node.right], keywords=[]), node)
+    return node
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(expression):
+    """Validate an arithmetic expression against a whitelist and compile it.
+
+    Only numbers, + - * / // % ** ^, parentheses, names and calls to plain
+    names are accepted; attribute access, subscripts, keywords and
+    underscore names are rejected. Compiled code objects are LRU-cached.
+    """
+    try:
+        tree = ast.parse(_caret_to_pow(expression.strip()), mode="eval")
+    except SyntaxError:
+        raise ExpressionError("Invalid expression") from None
+    except RecursionError:
+        raise ExpressionError("Expression is nested too deeply") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALC_NODES):
+            raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ExpressionError(f"Unsupported value: {node.value!r}")
+        if isinstance(node, ast.Name) and node.id.startswith("_"):
+            raise ExpressionError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.BinOp):
+            node.left = _rewrite_pow(node.left)
+            node.right = _rewrite_pow(node.right)
+        elif isinstance(node, ast.UnaryOp):
+            node.operand = _rewrite_pow(node.operand)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                raise ExpressionError("Only plain function calls are allowed")
+            node.args = [_rewrite_pow(arg) for arg in node.args]
+    tree.body = _rewrite_pow(tree.body)
+    try:
+        return compile(tree, "<calculator>", "eval")
+    except RecursionError:
+        raise ExpressionError("Expression is nested too deeply") from None
+
+
+def evaluate_expression(expression, variables=None):
+    """Evaluate a calculator expression; `variables` binds extra names."""
+    code = compile_expression(expression)
+    try:
+        return eval(code, _CALC_GLOBALS, variables or {})
+    except NameError as e:
+        raise ExpressionError(str(e).capitalize()) from None
+
+
+# ---------------------- TABLE MODE ---------------------- #
+def column_variable(header):
+    """Variable name for a CSV column: "Unit Price" -> "Unit_Price"."""
+    name = re.sub(r"\W", "_", header.strip())
+    # Leading underscores would reach the engine's private names (_pow),
+    # and keywords are not valid names at all.
+    if not name or name[0].isdigit() or name.startswith("_") or keyword.iskeyword(name):
+        return f"c_{name}"
+    return name
+
+
+def _float_factorial(n):
+    if not (n >= 0 and float(n).is_integer()):
+        return math.nan
+    return float(math.factorial(int(n))) if n <= 170 else math.inf
+
+
+@functools.lru_cache(maxsize=None)
+def _table_globals():
+    # NumPy counterparts of CALC_NAMESPACE, applied to whole columns at once.
+    np = _import_heavy("numpy")
+
+    def log(x, base=None):
+        return np.log(x) if base is None else np.log(x) / np.log(base)
+
+    namespace = {
+        "pi": np.pi, "e": np.e, "tau": 2 * np.pi,
+        "sqrt": np.sqrt, "exp": np.exp, "log": log, "log10": np.log10, "log2": np.log2,
+        "sin": np.sin, "cos": np.cos, "tan": np.tan,
+        "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+        "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+        "degrees": np.degrees, "radians": np.radians, "hypot": np.hypot,
+        "floor": np.floor, "ceil": np.ceil, "abs": np.abs, "round": np.round,
+        "factorial": np.vectorize(_float_factorial, otypes=[float]),
+    }
+    # float_power, unlike power, allows integer literals to negative powers (2**-1).
+    return {"__builtins__": {}, "_pow": np.float_power, **namespace}
+
+
+def evaluate_columns(expression, columns, length):
+    """Evaluate a calculator expression over NumPy columns keyed by variable name.
+
+    Returns a float array of `length` values; invalid results (division by
+    zero, log of a negative, ...) are NaN or inf rather than errors.
+    """
+    np = _import_heavy("numpy")
+    code = compile_expression(expression)
+    with np.errstate(all="ignore"):
+        try:
+            result = eval(code, _table_globals(), columns)
+        except NameError as e:
+            raise ExpressionError(str(e).capitalize()) from None
+    return np.broadcast_to(np.asarray(result, dtype=float), (length,))
+
+
+def evaluate_csv_stream(src, dst, expression, result_column="result", chunk_size=65536, progress=None, cancel=None):
+    """Evaluate `expression` for every row of CSV text read from `src`, writing to `dst`.
+
+    Column headers are bound as variables (see column_variable). Only the
+    columns the expression uses are parsed, as float64 (NaN for non-numbers),
+    and each chunk of `chunk_size` rows is evaluated in one vectorized pass,
+    so memory stays flat regardless of input size. Each row is written back
+    with a `result_column` cell, left empty when the result is not finite.
+    `progress(rows)` is called after every chunk and `cancel` is a
+    threading.Event that stops the run early.
+
+    Returns a summary dict with rows, invalid, seconds, rows_per_sec and
+    cancelled.
+    """
+    np = _import_heavy("numpy")
+    code = compile_expression(expression)
+    namespace = _table_globals()
+    start = time.perf_counter()
+    rows = invalid = 0
+    cancelled = False
+    reader = csv.reader(src)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("The CSV file is empty.")
+    variables = {}
+    for col, name in enumerate(header):
+        variables.setdefault(column_variable(name), col)
+    for name in code.co_names:
+        if name not in variables and name not in namespace:
+            raise ExpressionError(f"Unknown name: {name} (columns: {', '.join(variables)})")
+    used = {name: variables[name] for name in code.co_names if name in variables}
+
+    writer = csv.writer(dst)
+    writer.writerow(header + [result_column])
+    while True:
+        chunk = list(itertools.islice(reader, chunk_size))
+        if not chunk:
+            break
+        count = len(chunk)
+        columns = {
+            name: np.fromiter((_to_float(_cell(row, col)) for row in chunk), dtype=float, count=count)
+            for name, col in used.items()
+        }
+        values = evaluate_columns(expression, columns, count)
+        valid = np.isfinite(values)
+        invalid += count - int(valid.sum())
+        rows += count
+        writer.writerows(
+            row + [f"{value:.12g}" if ok else ""]
+            for row, value, ok in zip(chunk, values.tolist(), valid.tolist())
+        )
+        if progress is not None:
+            progress(rows)
+        if cancel is not None and cancel.is_set():
+            cancelled = True
+            break
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "invalid": invalid,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+        "cancelled": cancelled,
+    }
@@ -0,0 +1,292 @@
+"""Command-line interface: `python -m toolbox_core <command>` or `python toolbox.py <command>`.
+
+Each command imports only the core module it needs, so startup stays well
+under 100 ms. Commands that take values read them from stdin, one per line,
+when none are given on the command line, and write one result per line, so
+they can sit in a shell pipeline.
+"""
+import argparse
+import sys
+
+
+def _inputs(values):
+    """Command-line values, or stripped non-empty stdin lines when there are none."""
+    if values:
+        yield from values
+        return
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _emit(text):
+    sys.stdout.write(text)
+    sys.stdout.write("\n")
+
+
+def _error(message):
+    sys.stderr.write(f"toolbox: {message}\n")
+
+
+def _cmd_convert(args):
+    from toolbox_core.convert import UNIT_REGISTRY, convert_unit
+
+    if args.list:
+        for category, units in UNIT_REGISTRY.items():
+            _emit(f"{category}: {', '.join(units)}")
+        return 0
+    if not args.from_unit or not args.to_unit:
+        _error("convert needs FROM and TO units (see --list)")
+        return 2
+    status = 0
+    for value in _inputs(args.values):
+        try:
+            _emit(f"{convert_unit(float(value), args.from_unit, args.to_unit):.10g}")
+        except (KeyError, ValueError) as e:
+            _error(f"{value}: {e}")
+            status = 1
+    return status
+
+
+def _cmd_currency(args):
+    from toolbox_core.currency import ExchangeRateCache, convert_currency_stream
+
+    cache = ExchangeRateCache(ttl=args.ttl, **({"url": args.url} if args.url else {}))
+    try:
+        rates = cache.get_rates()
+    except Exception as e:
+        _error(f"could not fetch exchange rates: {e}")
+        return 1
+    if cache.source == "snapshot":
+        _error("offline, using the saved exchange rates")
+    from_curr = args.from_curr.upper() if args.from_curr else None
+    to_curr = args.to_curr.upper() if args.to_curr else None
+    if args.csv:
+        try:
+            summary = convert_currency_stream(sys.stdin, sys.stdout, rates, from_curr, to_curr)
+        except ValueError as e:
+            _error(str(e))
+            return 1
+        if args.verbose:
+            _error(f"{summary['rows']:,} rows ({summary['skipped']:,} skipped) at {summary['rows_per_sec']:,.0f} rows/s")
+        return 0
+    if not from_curr or not to_curr:
+        _error("currency needs FROM and TO codes, or --csv")
+        return 2
+    try:
+        rate = cache.rate(from_curr, to_curr)
+    except KeyError as e:
+        _error(e.args[0])
+        return 1
+    status = 0
+    for amount in _inputs(args.amounts):
+        try:
+            _emit(f"{float(amount) * rate:.2f}")
+        except ValueError:
+            _error(f"{amount}: not a number")
+            status = 1
+    return status
+
+
+def _cmd_history(args):
+    from toolbox_core.currency import HistoricalRateStore, convert_history_stream
+
+    store = HistoricalRateStore(args.db, base=args.base.upper())
+    try:
+        if args.action == "import":
+            for path in args.files:
+                try:
+                    count = store.import_file(path)
+                except (OSError, ValueError, KeyError) as e:
+                    _error(f"{path}: {e}")
+                    return 1
+                _error(f"{path}: {count:,} rates")
+            first, last = store.date_range()
+            _error(f"{len(store):,} rates for {len(store.currencies())} currencies, {first} to {last}")
+            return 0
+        if args.action == "rate":
+            status = 0
+            for date in _inputs(args.dates):
+                try:
+                    _emit(f"{date} {store.rate(args.from_curr.upper(), args.to_curr.upper(), date):.6g}")
+                except (KeyError, ValueError) as e:
+                    _error(e.args[0])
+                    status = 1
+            return status
+        from_curr = args.from_curr.upper() if args.from_curr else None
+        to_curr = args.to_curr.upper() if args.to_curr else None
+        try:
+            summary = convert_history_stream(sys.stdin, sys.stdout, store, from_curr, to_curr)
+        except ValueError as e:
+            _error(str(e))
+            return 1
+        if args.verbose:
+            _error(f"{summary['rows']:,} rows ({summary['skipped']:,} skipped) at {summary['rows_per_sec']:,.0f} rows/s")
+        return 0
+    finally:
+        store.close()
+
+
+def _cmd_passgen(args):
+    from toolbox_core.password import PASSWORD_CLASSES, write_passwords
+
+    classes = tuple(name.strip() for name in args.classes.split(",") if name.strip())
+    unknown = [name for name in classes if name not in PASSWORD_CLASSES]
+    if unknown or not classes:
+        _error(f"unknown character classes: {', '.join(unknown) or '(none)'}; choose from {', '.join(PASSWORD_CLASSES)}")
+        return 2
+    try:
+        summary = write_passwords(sys.stdout, args.count, args.length, classes)
+    except ValueError as e:
+        _error(str(e))
+        return 2
+    if args.verbose:
+        _error(f"{summary['count']:,} passwords, {summary['entropy_bits']:.1f} bits each, {summary['rate']:,.0f}/s")
+    return 0
+
+
+def _cmd_qr(args):
+    from toolbox_core import qr
+
+    if args.batch:
+        src_path, output_path = args.batch
+        fmt = "svg" if args.format == "svg" else "png"
+        summary = qr.generate_qr_batch(src_path, output_path, fmt=fmt, error_correction=args.error_correction,
+                                       box_size=args.box_size, border=args.border)
+        _error(f"{summary['count']:,} codes written, {summary['failed']:,} failed")
+        return 1 if summary["failed"] else 0
+    data = args.data if args.data is not None else sys.stdin.read().rstrip("\r\n")
+    if not data:
+        _error("qr needs DATA or input on stdin")
+        return 2
+    matrix = qr.render_qr_matrix(data, args.error_correction, args.version, args.border)
+    output = args.output
+    fmt = args.format or ("svg" if not output or output.lower().endswith(".svg") else "png")
+    if fmt == "svg":
+        svg = qr.qr_matrix_svg(matrix, args.box_size)
+        if output:
+            with open(output, "w", encoding="utf-8") as file:
+                file.write(svg)
+        else:
+            _emit(svg)
+    elif output:
+        qr.qr_matrix_image(matrix, args.box_size).save(output)
+    else:
+        qr.qr_matrix_image(matrix, args.box_size).save(sys.stdout.buffer, format="PNG")
+    return 0
+
+
+def _cmd_calc(args):
+    from toolbox_core.calc import evaluate_csv_stream, evaluate_expression
+
+    if args.csv:
+        if len(args.expressions) != 1:
+            _error("calc --csv needs exactly one EXPR")
+            return 2
+        try:
+            summary = evaluate_csv_stream(sys.stdin, sys.stdout, args.expressions[0], args.column)
+        except (ValueError, ArithmeticError, TypeError) as e:
+            _error(str(e))
+            return 1
+        if args.verbose:
+            _error(f"{summary['rows']:,} rows ({summary['invalid']:,} invalid) at {summary['rows_per_sec']:,.0f} rows/s")
+        return 0
+    variables = {}
+    for assignment in args.var:
+        name, _, value = assignment.partition("=")
+        try:
+            variables[name.strip()] = evaluate_expression(value, variables)
+        except (ValueError, ArithmeticError, TypeError) as e:
+            _error(f"{assignment}: {e}")
+            return 2
+    status = 0
+    for expression in _inputs(args.expressions):
+        try:
+            _emit(str(evaluate_expression(expression, variables)))
+        except (ValueError, ArithmeticError, TypeError) as e:
+            _error(f"{expression}: {e}")
+            status = 1
+    return status
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="toolbox", description="Toolbox command-line tools.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    convert = commands.add_parser("convert", help="convert values between units")
+    convert.add_argument("from_unit", nargs="?", metavar="FROM")
+    convert.add_argument("to_unit", nargs="?", metavar="TO")
+    convert.add_argument("values", nargs="*", metavar="VALUE", help="values to convert (default: stdin)")
+    convert.add_argument("--list", action="store_true", help="list the available units")
+    convert.set_defaults(handler=_cmd_convert)
+
+    currency = commands.add_parser("currency", help="convert amounts between currencies")
+    currency.add_argument("from_curr", nargs="?", metavar="FROM")
+    currency.add_argument("to_curr", nargs="?", metavar="TO")
+    currency.add_argument("amounts", nargs="*", metavar="AMOUNT", help="amounts to convert (default: stdin)")
+    currency.add_argument("--csv", action="store_true",
+                          help="convert the 'amount' column of CSV on stdin; FROM/TO are defaults for rows without from/to columns")
+    currency.add_argument("--ttl", type=float, default=3600, help="seconds before cached rates are refreshed")
+    currency.add_argument("--url", help="exchange-rate API URL")
+    currency.add_argument("-v", "--verbose", action="store_true", help="report throughput on stderr")
+    currency.set_defaults(handler=_cmd_currency)
+
+    history = commands.add_parser("history", help="historical exchange rates from a local database")
+    history.add_argument("--db", help="database file (default: ~/.toolbox/exchange_history.sqlite3)")
+    history.add_argument("--base", default="USD", help="base currency of a new database")
+    actions = history.add_subparsers(dest="action", metavar="ACTION", required=True)
+    history_import = actions.add_parser("import", help="bulk-import CSV or JSON rate dumps")
+    history_import.add_argument("files", nargs="+", metavar="FILE")
+    history_rate = actions.add_parser("rate", help="rate on or before each date")
+    history_rate.add_argument("from_curr", metavar="FROM")
+    history_rate.add_argument("to_curr", metavar="TO")
+    history_rate.add_argument("dates", nargs="*", metavar="DATE", help="ISO dates (default: stdin)")
+    history_convert = actions.add_parser(
+        "convert", help="convert CSV on stdin with date/amount columns at each row's date")
+    history_convert.add_argument("from_curr", nargs="?", metavar="FROM")
+    history_convert.add_argument("to_curr", nargs="?", metavar="TO")
+    history_convert.add_argument("-v", "--verbose", action="store_true", help="report throughput on stderr")
+    history.set_defaults(handler=_cmd_history)
+
+    passgen = commands.add_parser("passgen", help="generate random passwords")
+    passgen.add_argument("-n", "--count", type=int, default=1)
+    passgen.add_argument("-l", "--length", type=int, default=12)
+    passgen.add_argument("-c", "--classes", default="upper,lower,digits",
+                         help="comma-separated character classes: upper, lower, digits, symbols")
+    passgen.add_argument("-v", "--verbose", action="store_true", help="report entropy and rate on stderr")
+    passgen.set_defaults(handler=_cmd_passgen)
+
+    qr = commands.add_parser("qr", help="generate QR codes")
+    qr.add_argument("data", nargs="?", metavar="DATA", help="payload (default: all of stdin)")
+    qr.add_argument("-o", "--output", help="output file, .png or .svg (default: SVG on stdout)")
+    qr.add_argument("-f", "--format", choices=("png", "svg"))
+    qr.add_argument("-e", "--error-correction", choices=("L", "M", "Q", "H"), default="M")
+    qr.add_argument("--version", type=int, choices=range(1, 41), metavar="1-40", help="QR version (default: smallest that fits)")
+    qr.add_argument("--box-size", type=int, default=10)
+    qr.add_argument("--border", type=int, default=4)
+    qr.add_argument("--batch", nargs=2, metavar=("SRC", "OUTPUT"),
+                    help="one code per row of a CSV/text file, into a .zip or a folder")
+    qr.set_defaults(handler=_cmd_qr)
+
+    calc = commands.add_parser("calc", help="evaluate arithmetic expressions")
+    calc.add_argument("expressions", nargs="*", metavar="EXPR", help="expressions (default: stdin)")
+    calc.add_argument("--var", action="append", default=[], metavar="NAME=EXPR", help="bind a variable")
+    calc.add_argument("--csv", action="store_true",
+                      help="evaluate EXPR for every row of CSV on stdin, with columns bound as variables")
+    calc.add_argument("--column", default="result", help="name of the result column added by --csv")
+    calc.add_argument("-v", "--verbose", action="store_true", help="report throughput on stderr")
+    calc.set_defaults(handler=_cmd_calc)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); stop quietly.
+        sys.stderr.close()
+        return 0
+    except KeyboardInterrupt:
+        return 130
@@ -0,0 +1,143 @@
+"""Unit conversion tables."""
+from toolbox_core import _import_heavy
+
+
+# ---------------------- UNIT REGISTRY ---------------------- #
+# Each unit is (factor, offset) relative to its category's base unit:
+#     base_value = value * factor + offset
+# Unit names are unique across categories.
+UNIT_REGISTRY = {
+    "Temperature": {  # base: Celsius
+        "Celsius": (1.0, 0.0),
+        "Fahrenheit": (5 / 9, -32 * 5 / 9),
+        "Kelvin": (1.0, -273.15),
+        "Rankine": (5 / 9, -273.15),
+    },
+    "Length": {  # base: meter
+        "Millimeters": (0.001, 0.0),
+        "Centimeters": (0.01, 0.0),
+        "Meters": (1.0, 0.0),
+        "Kilometers": (1000.0, 0.0),
+        "Inches": (0.0254, 0.0),
+        "Feet": (0.3048, 0.0),
+        "Yards": (0.9144, 0.0),
+        "Miles": (1609.344, 0.0),
+        "Nautical Miles": (1852.0, 0.0),
+    },
+    "Weight": {  # base: kilogram
+        "Milligrams": (1e-6, 0.0),
+        "Grams": (0.001, 0.0),
+        "Kilograms": (1.0, 0.0),
+        "Tonnes": (1000.0, 0.0),
+        "Ounces": (0.028349523125, 0.0),
+        "Pounds": (0.45359237, 0.0),
+        "Stones": (6.35029318, 0.0),
+    },
+    "Area": {  # base: square meter
+        "Square Centimeters": (1e-4, 0.0),
+        "Square Meters": (1.0, 0.0),
+        "Square Kilometers": (1e6, 0.0),
+        "Square Inches": (0.00064516, 0.0),
+        "Square Feet": (0.09290304, 0.0),
+        "Square Yards": (0.83612736, 0.0),
+        "Acres": (4046.8564224, 0.0),
+        "Hectares": (10000.0, 0.0),
+        "Square Miles": (2589988.110336, 0.0),
+    },
+    "Volume": {  # base: liter
+        "Milliliters": (0.001, 0.0),
+        "Liters": (1.0, 0.0),
+        "Cubic Meters": (1000.0, 0.0),
+        "Teaspoons (US)": (0.00492892159375, 0.0),
+        "Tablespoons (US)": (0.01478676478125, 0.0),
+        "Fluid Ounces (US)": (0.0295735295625, 0.0),
+        "Cups (US)": (0.2365882365, 0.0),
+        "Pints (US)": (0.473176473, 0.0),
+        "Quarts (US)": (0.946352946, 0.0),
+        "Gallons (US)": (3.785411784, 0.0),
+        "Gallons (UK)": (4.54609, 0.0),
+        "Cubic Feet": (28.316846592, 0.0),
+    },
+    "Speed": {  # base: meter per second
+        "Meters per Second": (1.0, 0.0),
+        "Kilometers per Hour": (1 / 3.6, 0.0),
+        "Miles per Hour": (0.44704, 0.0),
+        "Feet per Second": (0.3048, 0.0),
+        "Knots": (1852 / 3600, 0.0),
+    },
+    "Pressure": {  # base: pascal
+        "Pascals": (1.0, 0.0),
+        "Kilopascals": (1000.0, 0.0),
+        "Bar": (100000.0, 0.0),
+        "Atmospheres": (101325.0, 0.0),
+        "PSI": (6894.757293168, 0.0),
+        "mmHg": (133.322387415, 0.0),
+    },
+    "Data Size": {  # base: byte
+        "Bits": (0.125, 0.0),
+        "Bytes": (1.0, 0.0),
+        "Kilobytes": (1e3, 0.0),
+        "Megabytes": (1e6, 0.0),
+        "Gigabytes": (1e9, 0.0),
+        "Terabytes": (1e12, 0.0),
+        "Kibibytes": (1024.0, 0.0),
+        "Mebibytes": (1024.0 ** 2, 0.0),
+        "Gibibytes": (1024.0 ** 3, 0.0),
+        "Tebibytes": (1024.0 ** 4, 0.0),
+    },
+    "Time": {  # base: second
+        "Milliseconds": (0.001, 0.0),
+        "Seconds": (1.0, 0.0),
+        "Minutes": (60.0, 0.0),
+        "Hours": (3600.0, 0.0),
+        "Days": (86400.0, 0.0),
+        "Weeks": (604800.0, 0.0),
+        "Years": (31536000.0, 0.0),
+    },
+    "Energy": {  # base: joule
+        "Joules": (1.0, 0.0),
+        "Kilojoules": (1000.0, 0.0),
+        "Calories": (4.184, 0.0),
+        "Kilocalories": (4184.0, 0.0),
+        "Watt-hours": (3600.0, 0.0),
+        "Kilowatt-hours": (3.6e6, 0.0),
+        "BTU": (1055.05585262, 0.0),
+        "Electronvolts": (1.602176634e-19, 0.0),
+    },
+}
+
+
+def _build_unit_tables(registry):
+    categories = {}
+    pairs = {}
+    for category, units in registry.items():
+        for from_u, (from_factor, from_offset) in units.items():
+            if from_u in categories:
+                raise ValueError(f"Duplicate unit name: {from_u}")
+            categories[from_u] = category
+            for to_u, (to_factor, to_offset) in units.items():
+                # value -> base -> target folded into a single scale and shift
+                pairs[(from_u, to_u)] = (from_factor / to_factor, (from_offset - to_offset) / to_factor)
+    return categories, pairs
+
+
+UNIT_CATEGORIES, UNIT_CONVERSIONS = _build_unit_tables(UNIT_REGISTRY)
+
+
+def _unit_pair(from_u, to_u):
+    try:
+        return UNIT_CONVERSIONS[(from_u, to_u)]
+    except KeyError:
+        raise ValueError(f"Cannot convert {from_u} to {to_u}") from None
+
+
+def convert_unit(value, from_u, to_u):
+    scale, shift = _unit_pair(from_u, to_u)
+    return value * scale + shift
+
+
+def convert_many(values, from_u, to_u):
+    """Convert a sequence of values at once; returns a NumPy array."""
+    np = _import_heavy("numpy")
+    scale, shift = _unit_pair(from_u, to_u)
+    return np.asarray(values, dtype=float) * scale + shift
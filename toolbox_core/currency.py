@@ -0,0 +1,437 @@
+"""Exchange rates, historical rates and bulk currency conversion."""
+import csv
+import datetime
+import functools
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from toolbox_core import DATA_DIR, _cell, _import_heavy, _to_float
+
+
+# ---------------------- EXCHANGE RATES ---------------------- #
+class ExchangeRateCache:
+    """Base-currency rate table with an in-memory TTL and an on-disk snapshot.
+
+    One request fetches every rate against `base`; cross rates between any two
+    currencies are derived locally. If the network is unavailable the last
+    snapshot is used, however old it is.
+    """
+
+    DEFAULT_URL = "https://api.exchangerate.host/latest"
+
+    def __init__(self, base="USD", ttl=3600, snapshot_path=None, url=DEFAULT_URL, timeout=10):
+        self.base = base
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path or os.path.join(DATA_DIR, "exchange_rates.json")
+        self.url = url
+        self.timeout = timeout
+        self.rates = None
+        self.fetched_at = None  # wall-clock time, so it survives restarts
+        self.source = None  # "network", "snapshot" or "cache"
+        self._session = None
+        # Serializes refreshes, so concurrent callers on a stale cache share
+        # one request instead of each fetching and rewriting the snapshot.
+        self._lock = threading.Lock()
+        self._load_snapshot()
+
+    @property
+    def session(self):
+        if self._session is None:
+            requests = _import_heavy("requests")
+            self._session = requests.Session()
+        return self._session
+
+    def is_fresh(self):
+        return self.rates is not None and time.time() - self.fetched_at < self.ttl
+
+    def get_rates(self, force=False):
+        """Return {currency: units per base}, fetching only when the cache is stale."""
+        if not force and self.is_fresh():
+            # A snapshot within the TTL is as good as a cached fetch; only a
+            # failed refresh means the rates are served offline.
+            self.source = "cache"
+            return self.rates
+        with self._lock:
+            if not force and self.is_fresh():
+                # Another caller refreshed while this one waited for the lock.
+                self.source = "cache"
+                return self.rates
+            try:
+                self._fetch()
+            except Exception:
+                if self.rates is None:
+                    raise
+                self.source = "snapshot"
+            return self.rates
+
+    def rate(self, from_curr, to_curr):
+        rates = self.get_rates()
+        try:
+            return rates[to_curr] / rates[from_curr]
+        except KeyError as e:
+            raise KeyError(f"No exchange rate for {e.args[0]}") from None
+
+    def convert(self, amount, from_curr, to_curr):
+        return amount * self.rate(from_curr, to_curr)
+
+    def cross_rates(self, currencies):
+        """Return {(from, to): rate} for every ordered pair in `currencies`."""
+        rates = self.get_rates()
+        return {(a, b): rates[b] / rates[a] for a in currencies for b in currencies}
+
+    def _fetch(self):
+        response = self.session.get(self.url, params={"base": self.base}, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        if not data.get("success", True) or not data.get("rates"):
+            raise ValueError("Exchange rate service returned no rates")
+        rates = {code: float(value) for code, value in data["rates"].items()}
+        rates[self.base] = 1.0
+        self.rates = rates
+        self.fetched_at = time.time()
+        self.source = "network"
+        self._save_snapshot()
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            if snapshot.get("base") != self.base:
+                return
+            rates = {code: float(value) for code, value in snapshot["rates"].items()}
+            fetched_at = float(snapshot["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return  # unreadable or malformed: as if there were no snapshot
+        self.rates = rates
+        self.fetched_at = fetched_at
+        self.source = "snapshot"
+
+    def _save_snapshot(self):
+        # Write to a temp file and rename so a crash never leaves a torn snapshot.
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump({"base": self.base, "fetched_at": self.fetched_at, "rates": self.rates}, file)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            pass
+
+
+def convert_currency_csv(src_path, dst_path, rates, from_curr=None, to_curr=None, chunk_size=65536):
+    """Convert the `amount` column of the CSV file at `src_path` into `dst_path`.
+
+    See convert_currency_stream for the column handling and the summary dict.
+    """
+    with open(src_path, "r", newline="", encoding="utf-8") as src, \
+            open(dst_path, "w", newline="", encoding="utf-8") as dst:
+        return convert_currency_stream(src, dst, rates, from_curr, to_curr, chunk_size)
+
+
+def convert_currency_stream(src, dst, rates, from_curr=None, to_curr=None, chunk_size=65536):
+    """Convert the `amount` column of CSV text read from `src`, writing to `dst`.
+
+    `rates` maps currency codes to units per base currency (as returned by
+    ExchangeRateCache.get_rates). Per-row `from`/`to` columns override the
+    `from_curr`/`to_curr` defaults; empty cells use them. Rows are streamed
+    in chunks of `chunk_size`, so memory stays flat regardless of input size.
+    Each row is written back with a `converted` column, left empty when the
+    amount or a currency code is invalid.
+
+    Returns a summary dict with rows, skipped, seconds and rows_per_sec.
+    """
+    np = _import_heavy("numpy")
+    codes = sorted(rates)
+    index = {code: i for i, code in enumerate(codes)}
+    unknown = len(codes)
+    table = np.array([float(rates[code]) for code in codes] + [np.nan])
+
+    start = time.perf_counter()
+    rows = skipped = 0
+    reader = csv.reader(src)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("The CSV file is empty.")
+    columns = [name.strip().lower() for name in header]
+    if "amount" not in columns:
+        raise ValueError("The CSV file needs an 'amount' column.")
+    amount_col = columns.index("amount")
+    from_col = columns.index("from") if "from" in columns else None
+    to_col = columns.index("to") if "to" in columns else None
+    if (from_col is None and not from_curr) or (to_col is None and not to_curr):
+        raise ValueError("Add 'from'/'to' columns or choose default currencies.")
+    from_default = index.get(from_curr, unknown)
+    to_default = index.get(to_curr, unknown)
+
+    writer = csv.writer(dst)
+    writer.writerow(header + ["converted"])
+    while True:
+        chunk = list(itertools.islice(reader, chunk_size))
+        if not chunk:
+            break
+        count = len(chunk)
+        amounts = np.fromiter((_to_float(_cell(row, amount_col)) for row in chunk), dtype=float, count=count)
+        if from_col is None:
+            from_idx = np.full(count, from_default)
+        else:
+            from_idx = np.fromiter((index.get(_cell(row, from_col).upper() or from_curr, unknown) for row in chunk),
+                                   dtype=np.intp, count=count)
+        if to_col is None:
+            to_idx = np.full(count, to_default)
+        else:
+            to_idx = np.fromiter((index.get(_cell(row, to_col).upper() or to_curr, unknown) for row in chunk),
+                                 dtype=np.intp, count=count)
+        converted = amounts * table[to_idx] / table[from_idx]
+        valid = np.isfinite(converted)
+        skipped += count - int(valid.sum())
+        rows += count
+        writer.writerows(
+            row + [f"{value:.2f}" if ok else ""]
+            for row, value, ok in zip(chunk, converted.tolist(), valid.tolist())
+        )
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "skipped": skipped,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+    }
+
+
+# ---------------------- HISTORICAL RATES ---------------------- #
+def _day(text):
+    """Ordinal of an ISO date ("2024-01-31"), or 0 when it is not one."""
+    try:
+        return datetime.date.fromisoformat(text.strip()[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+class HistoricalRateStore:
+    """Daily exchange rates in a local SQLite database.
+
+    Rates are units per `base` currency, one per (currency, date), so cross
+    rates on a day are derived like ExchangeRateCache.rate. The table's
+    primary key is that pair, making "the rate on or before a date" a single
+    index seek. The base is fixed when the database is created.
+    """
+
+    def __init__(self, path=None, base="USD"):
+        self.path = path or os.path.join(DATA_DIR, "exchange_history.sqlite3")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS rates (currency TEXT NOT NULL, date TEXT NOT NULL, rate REAL NOT NULL,"
+                " PRIMARY KEY (currency, date)) WITHOUT ROWID")
+            self.connection.execute("INSERT OR IGNORE INTO meta VALUES ('base', ?)", (base,))
+        self.base = self.connection.execute("SELECT value FROM meta WHERE key = 'base'").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM rates").fetchone()[0]
+
+    def currencies(self):
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT currency FROM rates ORDER BY currency")]
+
+    def date_range(self):
+        """(first, last) ISO dates in the store, or (None, None) when empty."""
+        return self.connection.execute("SELECT MIN(date), MAX(date) FROM rates").fetchone()
+
+    def import_records(self, records):
+        """Insert (date, currency, rate) tuples in one transaction; returns how many."""
+        count = 0
+
+        def rows():
+            nonlocal count
+            for date, currency, rate in records:
+                day = _day(date)
+                if not day:
+                    raise ValueError(f"Invalid date: {date!r}")
+                count += 1
+                yield currency.strip().upper(), datetime.date.fromordinal(day).isoformat(), float(rate)
+
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO rates VALUES (?, ?, ?)", rows())
+        return count
+
+    def import_csv(self, src):
+        """Import CSV text from the file object `src`.
+
+        Either long format with date, currency and rate columns, or wide
+        format with a date column followed by one column per currency code.
+        Empty cells are skipped.
+        """
+        reader = csv.reader(src)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("The CSV file is empty.")
+        columns = [name.strip().lower() for name in header]
+        if "date" not in columns:
+            raise ValueError("The CSV file needs a 'date' column.")
+        date_col = columns.index("date")
+        if "currency" in columns and "rate" in columns:
+            currency_col, rate_col = columns.index("currency"), columns.index("rate")
+            records = ((_cell(row, date_col), _cell(row, currency_col), _cell(row, rate_col))
+                       for row in reader if _cell(row, rate_col))
+        else:
+            codes = [(col, name.strip().upper()) for col, name in enumerate(header) if col != date_col]
+            records = ((_cell(row, date_col), code, _cell(row, col))
+                       for row in reader for col, code in codes if _cell(row, col))
+        return self.import_records(records)
+
+    def import_json(self, src):
+        """Import a JSON dump from the file object `src`.
+
+        Accepts a time-series response, {"base": ..., "rates": {date:
+        {currency: rate}}}, or a list of {"date", "currency", "rate"} objects.
+        """
+        data = json.load(src)
+        if isinstance(data, list):
+            return self.import_records((item["date"], item["currency"], item["rate"]) for item in data)
+        base = data.get("base", self.base)
+        if base != self.base:
+            raise ValueError(f"The dump is based on {base}, this store on {self.base}.")
+        return self.import_records(
+            (date, currency, rate) for date, day_rates in data.get("rates", {}).items()
+            for currency, rate in day_rates.items())
+
+    def import_file(self, path):
+        """Import a .json or CSV dump at `path`; returns the number of rates."""
+        with open(path, "r", newline="", encoding="utf-8") as file:
+            if path.lower().endswith(".json"):
+                return self.import_json(file)
+            return self.import_csv(file)
+
+    def rate_on(self, currency, date):
+        """(date, rate) of the latest rate for `currency` on or before `date`, or None."""
+        day = _day(date)
+        if not day:
+            raise ValueError(f"Invalid date: {date!r}")
+        date = datetime.date.fromordinal(day).isoformat()
+        if currency == self.base:
+            return date, 1.0
+        return self.connection.execute(
+            "SELECT date, rate FROM rates WHERE currency = ? AND date <= ? ORDER BY date DESC LIMIT 1",
+            (currency, date)).fetchone()
+
+    def rate(self, from_curr, to_curr, date):
+        rates = []
+        for currency in (from_curr, to_curr):
+            found = self.rate_on(currency, date)
+            if found is None:
+                raise KeyError(f"No exchange rate for {currency} on or before {date}")
+            rates.append(found[1])
+        return rates[1] / rates[0]
+
+    def lookup_table(self):
+        """Every rate as sorted arrays for vectorized lookups.
+
+        Returns (index, keys, rates): `index` maps currency codes to small
+        integers and `keys` holds code index << 32 | day ordinal in the same
+        (currency, date) order as the primary key, so a single searchsorted
+        finds the rate on or before any (currency, day).
+        """
+        np = _import_heavy("numpy")
+        index = {}
+        keys = array("q")
+        rates = array("d")
+        for currency, date, rate in self.connection.execute("SELECT currency, date, rate FROM rates ORDER BY currency, date"):
+            keys.append(index.setdefault(currency, len(index)) << 32 | _day(date))
+            rates.append(rate)
+        return index, np.frombuffer(keys, dtype=np.int64), np.frombuffer(rates, dtype=float)
+
+
+def _rates_on_days(np, table, base, codes, days):
+    """Rate of each code index on or before each day; NaN where there is none."""
+    _, keys, rates = table
+    if not len(keys):
+        keys, rates = np.zeros(1, dtype=np.int64) - 1, np.full(1, np.nan)
+    wanted = codes.astype(np.int64) << 32 | days
+    pos = np.searchsorted(keys, wanted, side="right") - 1
+    found = (pos >= 0) & (keys[np.maximum(pos, 0)] >> 32 == codes) & (codes >= 0)
+    out = np.where(found, rates[np.maximum(pos, 0)], np.nan)
+    out[codes == base] = 1.0
+    return out
+
+
+def convert_history_stream(src, dst, store, from_curr=None, to_curr=None, chunk_size=65536):
+    """Convert `date`/`amount` CSV rows from `src` at each row's historical rate.
+
+    Like convert_currency_stream, but each row is converted at the rate on or
+    before its date. Empty `from`/`to` cells fall back to the defaults. The
+    store's rates are read into memory once (see
+    HistoricalRateStore.lookup_table) and each chunk is looked up with one
+    vectorized binary search per side. Rows with no rate at their date get an
+    empty `converted` column.
+
+    Returns a summary dict with rows, skipped, seconds and rows_per_sec.
+    """
+    np = _import_heavy("numpy")
+    start = time.perf_counter()
+    rows = skipped = 0
+    table = store.lookup_table()
+    index = dict(table[0])
+    base = index.setdefault(store.base, len(index))  # rows never match it, it is always 1.0
+    unknown = -1
+    day_of = functools.lru_cache(maxsize=65536)(_day)
+    reader = csv.reader(src)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("The CSV file is empty.")
+    columns = [name.strip().lower() for name in header]
+    if "amount" not in columns or "date" not in columns:
+        raise ValueError("The CSV file needs 'date' and 'amount' columns.")
+    amount_col = columns.index("amount")
+    date_col = columns.index("date")
+    from_col = columns.index("from") if "from" in columns else None
+    to_col = columns.index("to") if "to" in columns else None
+    if (from_col is None and not from_curr) or (to_col is None and not to_curr):
+        raise ValueError("Add 'from'/'to' columns or choose default currencies.")
+
+    writer = csv.writer(dst)
+    writer.writerow(header + ["converted"])
+    while True:
+        chunk = list(itertools.islice(reader, chunk_size))
+        if not chunk:
+            break
+        count = len(chunk)
+        amounts = np.fromiter((_to_float(_cell(row, amount_col)) for row in chunk), dtype=float, count=count)
+        days = np.fromiter((day_of(_cell(row, date_col)) for row in chunk), dtype=np.int64, count=count)
+        if from_col is None:
+            from_idx = np.full(count, index.get(from_curr, unknown), dtype=np.int64)
+        else:
+            from_idx = np.fromiter((index.get(_cell(row, from_col).upper() or from_curr, unknown) for row in chunk),
+                                 dtype=np.int64, count=count)
+        if to_col is None:
+            to_idx = np.full(count, index.get(to_curr, unknown), dtype=np.int64)
+        else:
+            to_idx = np.fromiter((index.get(_cell(row, to_col).upper() or to_curr, unknown) for row in chunk),
+                                 dtype=np.int64, count=count)
+        from_rates = _rates_on_days(np, table, base, from_idx, days)
+        to_rates = _rates_on_days(np, table, base, to_idx, days)
+        converted = amounts * to_rates / from_rates
+        converted[days == 0] = np.nan
+        valid = np.isfinite(converted)
+        skipped += count - int(valid.sum())
+        rows += count
+        writer.writerows(
+            row + [f"{value:.2f}" if ok else ""]
+            for row, value, ok in zip(chunk, converted.tolist(), valid.tolist())
+        )
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "skipped": skipped,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+    }
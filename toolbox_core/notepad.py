@@ -0,0 +1,489 @@
+"""Large-file viewing, edit journaling, text search and the document cache for the notepad."""
+import itertools
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+
+from toolbox_core import _write_atomic
+
+
+# ---------------------- LARGE FILES ---------------------- #
+# Files at least this big open read-only as a LargeFileView.
+LARGE_FILE_THRESHOLD = 16 * 1024 * 1024
+
+
+class LargeFileView:
+    """Read-only, memory-mapped view of a text file with a background line index.
+
+    The index stores the byte offset of every LINE_INDEX_STRIDE-th line, so it
+    stays small on multi-GB files; the lines in between are found by scanning
+    forward from the nearest indexed offset. Lines become readable as soon as
+    the indexer has passed them.
+    """
+
+    LINE_INDEX_STRIDE = 64
+    INDEX_CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self.size = len(self.mm)
+        self._offsets = array("q", [0])
+        self.indexed_lines = 0
+        self.indexed_bytes = 0
+        self.complete = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._build_index, daemon=True)
+        self._thread.start()
+
+    def _build_index(self):
+        stride = self.LINE_INDEX_STRIDE
+        mm = self.mm
+        lines = 0
+        pos = 0
+        try:
+            while pos < self.size and not self._closed:
+                end = min(pos + self.INDEX_CHUNK_SIZE, self.size)
+                chunk = mm[pos:end]
+                i = chunk.find(b"\n")
+                while i != -1:
+                    lines += 1
+                    if lines % stride == 0:
+                        self._offsets.append(pos + i + 1)
+                    i = chunk.find(b"\n", i + 1)
+                pos = end
+                self.indexed_lines = lines
+                self.indexed_bytes = pos
+        except ValueError:
+            return  # the map was closed underneath us
+        self.complete = not self._closed
+
+    @property
+    def line_count(self):
+        """Number of lines that can be read right now."""
+        if self.complete and self.size and self.mm[self.size - 1:self.size] != b"\n":
+            return self.indexed_lines + 1
+        return self.indexed_lines
+
+    def line_offset(self, line):
+        """Byte offset where 0-based `line` starts."""
+        if line >= self.line_count:
+            return self.size
+        pos = self._offsets[line // self.LINE_INDEX_STRIDE]
+        for _ in range(line % self.LINE_INDEX_STRIDE):
+            pos = self.mm.find(b"\n", pos) + 1
+        return pos
+
+    def read_lines(self, start, stop):
+        """Return lines [start, stop) as text."""
+        data = self.mm[self.line_offset(start):self.line_offset(stop)]
+        return data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+    def close(self):
+        self._closed = True
+        self._thread.join()
+        self.mm.close()
+        self._file.close()
+
+
+# ---------------------- EDIT JOURNAL ---------------------- #
+def read_text_file(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def _split_index(index):
+    line, col = index.split(".")
+    return int(line) - 1, int(col)
+
+
+def apply_text_edits(content, edits):
+    """Replay journal edits on `content`; indices are Tk "line.col" strings."""
+    lines = content.split("\n")
+    for edit in edits:
+        if edit[0] == "r":
+            lines = edit[1].split("\n")
+        elif edit[0] == "i":
+            row, col = _split_index(edit[1])
+            line = lines[row]
+            parts = edit[2].split("\n")
+            parts[0] = line[:col] + parts[0]
+            parts[-1] = parts[-1] + line[col:]
+            lines[row:row + 1] = parts
+        else:
+            (row1, col1), (row2, col2) = _split_index(edit[1]), _split_index(edit[2])
+            lines[row1:row2 + 1] = [lines[row1][:col1] + lines[row2][col2:]]
+    return "\n".join(lines)
+
+
+class EditJournal:
+    """Append-only log of Notepad edits made since the document was last saved.
+
+    The first line is a header naming the base file (None for an untitled
+    document) and its size/mtime fingerprint; every following line is one
+    edit. Appending is O(edit), so autosave is cheap and a crashed session can
+    be rebuilt from base + edits. compact() folds the edits into the base file
+    with an atomic temp-file-plus-rename and starts a fresh journal.
+
+    All file I/O is meant to run on one background thread; record_*() and
+    take_pending() are called from the Tk thread.
+    """
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self.base_path = None
+        self.base_fingerprint = None
+        self.pending = []
+
+    @staticmethod
+    def fingerprint(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def record_insert(self, index, text):
+        self.pending.append(["i", index, text])
+
+    def record_delete(self, start, end):
+        self.pending.append(["d", start, end])
+
+    def record_replace_all(self, text):
+        """Journal the whole buffer, for text that did not come from the base file."""
+        self.pending.append(["r", text])
+
+    def take_pending(self):
+        edits, self.pending = self.pending, []
+        return edits
+
+    def reset(self, base_path):
+        """Start a new journal against `base_path` (None for an untitled document)."""
+        self.base_path = base_path
+        self.base_fingerprint = self.fingerprint(base_path) if base_path else None
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        _write_atomic(self.journal_path, json.dumps({"base": base_path, "fingerprint": self.base_fingerprint}) + "\n")
+
+    def resume(self, base_path, base_fingerprint):
+        """Keep appending to an existing journal, e.g. after recovering it."""
+        self.base_path = base_path
+        self.base_fingerprint = base_fingerprint
+
+    def append(self, edits):
+        if not edits:
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(edit) + "\n" for edit in edits)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def compact(self, edits, content=None):
+        """Append `edits`, then rewrite the base file with every journaled edit applied.
+
+        If the base file changed since the journal was started, the edits no
+        longer apply to it: `content` (the whole buffer) is written instead,
+        or ValueError is raised when it is not given.
+        """
+        try:
+            changed = self.fingerprint(self.base_path) != self.base_fingerprint
+        except OSError:
+            changed = True
+        if changed:
+            if content is None:
+                raise ValueError(f"{self.base_path} changed on disk since it was opened")
+            self.save_as(self.base_path, content)
+            return
+        self.append(edits)
+        _, journaled = self._read(self.journal_path)
+        if journaled:
+            with open(self.base_path, "r", encoding="utf-8") as file:
+                content = apply_text_edits(file.read(), journaled)
+            tmp_path = self.base_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+            # rename keeps the temp file's size and mtime, so recover() can tell
+            # whether a crash happened before or after it.
+            self.append([{"compacted": self.fingerprint(tmp_path)}])
+            os.replace(tmp_path, self.base_path)
+        self.reset(self.base_path)
+
+    def save_as(self, path, content):
+        """Write the whole document to `path` and journal against it from now on."""
+        _write_atomic(path, content)
+        self.reset(path)
+
+    def discard(self):
+        self.reset(None)
+
+    @staticmethod
+    def _read(journal_path):
+        with open(journal_path, "r", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            edits = []
+            for line in file:
+                try:
+                    edits.append(json.loads(line))
+                except ValueError:
+                    break  # torn final write
+        return header, edits
+
+    @classmethod
+    def recover(cls, journal_path):
+        """Return (base_path, base_fingerprint, content) for a journal with unsaved edits, else None."""
+        try:
+            header, edits = cls._read(journal_path)
+        except (OSError, ValueError):
+            return None
+        if not edits or isinstance(edits[-1], dict):
+            return None  # nothing unsaved, or the last compaction only missed the journal reset
+        base_path = header.get("base")
+        try:
+            if base_path is None:
+                content = ""
+            elif cls.fingerprint(base_path) != header.get("fingerprint"):
+                return None  # the base file changed since, the edits no longer apply
+            else:
+                with open(base_path, "r", encoding="utf-8") as file:
+                    content = file.read()
+            return base_path, header.get("fingerprint"), apply_text_edits(content, edits)
+        except (OSError, ValueError, IndexError):
+            return None
+
+
+# ---------------------- TEXT SEARCH ---------------------- #
+def compile_search_pattern(query, regex=False, match_case=False, binary=False):
+    """Compile a Notepad search query; raises re.error for a bad regex."""
+    if not regex:
+        query = re.escape(query)
+    if binary:
+        query = query.encode("utf-8")
+    return re.compile(query, 0 if match_case else re.IGNORECASE)
+
+
+def find_text_matches(source, pattern, cancelled=None, batch_size=500):
+    """Yield batches of (line, col, end_line, end_col) matches, lines 0-based.
+
+    `source` is a str snapshot of a buffer, or a bytes-like object such as the
+    mmap of a LargeFileView (then `pattern` must be a bytes pattern and is
+    run chunk by chunk, so matches cannot span lines). `cancelled` is a
+    threading.Event checked between matches and chunks.
+    """
+    batch = []
+    if isinstance(source, str):
+        line, line_start, last = 0, 0, 0
+        for match in pattern.finditer(source):
+            if cancelled is not None and cancelled.is_set():
+                return
+            start, end = match.span()
+            if start == end:
+                continue
+            newlines = source.count("\n", last, start)
+            if newlines:
+                line += newlines
+                line_start = source.rfind("\n", 0, start) + 1
+            end_line = line + source.count("\n", start, end)
+            end_col = end - (source.rfind("\n", 0, end) + 1) if end_line != line else end - line_start
+            batch.append((line, start - line_start, end_line, end_col))
+            last = start
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    else:
+        chunk_size = LargeFileView.INDEX_CHUNK_SIZE
+        size = len(source)
+        pos = line = 0
+        while pos < size:
+            if cancelled is not None and cancelled.is_set():
+                return
+            end = min(pos + chunk_size, size)
+            if end < size:
+                end = source.rfind(b"\n", pos, end) + 1 or end
+            chunk = source[pos:end]
+            last = line_start = 0
+            for match in pattern.finditer(chunk):
+                start, stop = match.span()
+                if start == stop:
+                    continue
+                newlines = chunk.count(b"\n", last, start)
+                if newlines:
+                    line += newlines
+                    line_start = chunk.rfind(b"\n", 0, start) + 1
+                last = start
+                newline = chunk.find(b"\n", start, stop)
+                if newline > start:
+                    stop = newline  # clip to the first line of the match
+                col = len(chunk[line_start:start].decode("utf-8", errors="replace"))
+                width = len(chunk[start:stop].decode("utf-8", errors="replace"))
+                batch.append((line, col, line, col + width))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            line += chunk.count(b"\n", last)
+            pos = end
+    if batch:
+        yield batch
+
+
+# ---------------------- DOCUMENT CACHE ---------------------- #
+class Document:
+    """One open Notepad document and the view state to restore with it.
+
+    While a document is active its text lives in the editor. When inactive
+    it is held compressed by a DocumentCache, spilled to disk, or, if it has
+    no unsaved changes, simply re-read from `path`.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, path=None, large_file=None):
+        self.id = next(self._ids)
+        self.path = path
+        self.large_file = large_file  # LargeFileView for read-only large documents
+        self.tags = {}  # tag name -> flat list of "line.col" start/end indices
+        self.cursor = "1.0"
+        self.yview = 0.0  # scroll fraction, or the top line of a large file
+        self.revision = 0  # bumped on every edit
+        self.saved_revision = 0
+        self.fingerprint = None  # of `path` when its text was last read or saved
+        self.compressed = None
+        self.spill_path = None
+
+    @property
+    def dirty(self):
+        """True when the text differs from the file at `path` (or is unsaved)."""
+        return self.revision != self.saved_revision
+
+    @property
+    def title(self):
+        return os.path.basename(self.path) if self.path else f"Untitled {self.id}"
+
+
+class DocumentCache:
+    """LRU of inactive documents, zlib-compressed, within `budget_bytes`.
+
+    Parking a document compresses its text into memory; once the compressed
+    total exceeds the budget the least recently used documents are dropped
+    from memory. Documents with unsaved changes are also written to a spill
+    file under `spill_dir` as they are parked, so they survive both eviction
+    and a crash; clean ones are read back from their original file. read()
+    is instant for cached documents and touches the disk only for evicted
+    ones, so it can run on a worker thread.
+    """
+
+    def __init__(self, budget_bytes, spill_dir, level=1):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.level = level
+        self.used_bytes = 0
+        self._lru = OrderedDict()  # document id -> Document
+
+    def __len__(self):
+        return len(self._lru)
+
+    def in_memory(self, doc):
+        return doc.compressed is not None
+
+    def park(self, doc, text):
+        """Take `text` for an inactive document, then evict down to the budget."""
+        self.release(doc)
+        doc.compressed = zlib.compress(text.encode("utf-8"), self.level)
+        if doc.dirty:
+            self._spill(doc)
+        self._lru[doc.id] = doc
+        self.used_bytes += len(doc.compressed)
+        self.trim()
+
+    def trim(self):
+        # Dirty documents are already spilled, clean ones re-read from `path`.
+        while self.used_bytes > self.budget_bytes and self._lru:
+            _, doc = self._lru.popitem(last=False)
+            self.used_bytes -= len(doc.compressed)
+            doc.compressed = None
+
+    def _spill(self, doc):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        doc.spill_path = os.path.join(self.spill_dir, f"doc-{doc.id}.z")
+        tmp_path = doc.spill_path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(json.dumps({"path": doc.path}).encode("utf-8") + b"\n")
+            file.write(doc.compressed)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, doc.spill_path)
+
+    @staticmethod
+    def _read_spill(spill_path):
+        with open(spill_path, "rb") as file:
+            header = json.loads(file.readline())
+            return header, zlib.decompress(file.read()).decode("utf-8")
+
+    def read(self, doc):
+        """Return the document's text without changing the cache."""
+        compressed = doc.compressed
+        if compressed is not None:
+            return zlib.decompress(compressed).decode("utf-8")
+        if doc.spill_path is not None:
+            return self._read_spill(doc.spill_path)[1]
+        if doc.path is None:
+            return ""
+        text = read_text_file(doc.path)
+        if doc.fingerprint is not None and EditJournal.fingerprint(doc.path) != doc.fingerprint:
+            doc.tags = {}  # the file changed on disk, so the ranges no longer apply
+        return text
+
+    def saved(self, doc):
+        """Drop the spill file of an inactive document whose text is now on disk."""
+        if not doc.dirty and doc.path is not None and doc.spill_path is not None:
+            if doc.compressed is None:
+                return  # evicted: the spill file may be being read right now
+            self._remove_spill(doc)
+
+    def release(self, doc):
+        """Forget any stored copy, e.g. once the document is active again or closed."""
+        if self._lru.pop(doc.id, None) is not None:
+            self.used_bytes -= len(doc.compressed)
+        doc.compressed = None
+        self._remove_spill(doc)
+
+    def _remove_spill(self, doc):
+        if doc.spill_path is not None:
+            try:
+                os.remove(doc.spill_path)
+            except OSError:
+                pass
+            doc.spill_path = None
+
+    def recover(self):
+        """Return [(path, text)] of documents left unsaved by a previous session.
+
+        The spill files are deleted either way, so call this once at startup,
+        before any document is parked.
+        """
+        recovered = []
+        if not os.path.isdir(self.spill_dir):
+            return recovered
+        for name in sorted(os.listdir(self.spill_dir)):
+            spill_path = os.path.join(self.spill_dir, name)
+            if name.endswith(".z"):
+                try:
+                    header, text = self._read_spill(spill_path)
+                    path = header.get("path")
+                    if path is None or not os.path.exists(path) or read_text_file(path) != text:
+                        recovered.append((path, text))
+                except (OSError, ValueError, zlib.error):
+                    pass
+            if name.endswith((".z", ".tmp")):
+                try:
+                    os.remove(spill_path)
+                except OSError:
+                    pass
+        return recovered
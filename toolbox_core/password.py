@@ -0,0 +1,89 @@
+"""Password generation from the OS CSPRNG."""
+import itertools
+import math
+import string
+import secrets
+import time
+
+
+# ---------------------- PASSWORDS ---------------------- #
+PASSWORD_CLASSES = {
+    "upper": string.ascii_uppercase,
+    "lower": string.ascii_lowercase,
+    "digits": string.digits,
+    "symbols": string.punctuation,
+}
+
+
+def _password_pools(classes):
+    pools = [PASSWORD_CLASSES[name] for name in classes]
+    if not pools:
+        raise ValueError("Select at least one character type!")
+    return pools
+
+
+def password_entropy_bits(length, classes=("upper", "lower", "digits")):
+    """Entropy of a uniformly drawn password that uses every class at least once."""
+    sizes = [len(pool) for pool in _password_pools(classes)]
+    # Inclusion-exclusion over the classes that could be missing.
+    valid = 0
+    for mask in range(1 << len(sizes)):
+        missing = sum(size for i, size in enumerate(sizes) if mask >> i & 1)
+        sign = -1 if bin(mask).count("1") % 2 else 1
+        valid += sign * (sum(sizes) - missing) ** length
+    return math.log2(valid) if valid > 0 else 0.0
+
+
+def generate_passwords(count, length=12, classes=("upper", "lower", "digits")):
+    """Yield `count` passwords drawn from the OS CSPRNG.
+
+    Random bytes are drawn in bulk and mapped to the alphabet with
+    bytes.translate, dropping bytes at or above the largest multiple of the
+    alphabet size (rejection sampling, so there is no modulo bias). A password
+    missing any selected class is discarded and redrawn, which keeps the
+    result uniform over all valid passwords.
+    """
+    pools = _password_pools(classes)
+    if length < len(pools):
+        raise ValueError(f"Length must be at least {len(pools)} to use every character type.")
+    alphabet = "".join(pools).encode("ascii")
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(alphabet[i % len(alphabet)] for i in range(256))
+    rejected = bytes(range(limit, 256))
+    class_bytes = [pool.encode("ascii") for pool in pools]
+    produced = 0
+    buffer = b""
+    while produced < count:
+        wanted = min(count - produced, 65536) * length
+        buffer += secrets.token_bytes(wanted * 2 + 64).translate(table, rejected)
+        pos = 0
+        while produced < count and pos + length <= len(buffer):
+            candidate = buffer[pos:pos + length]
+            pos += length
+            if all(len(candidate.translate(None, chars)) < length for chars in class_bytes):
+                produced += 1
+                yield candidate.decode("ascii")
+        buffer = buffer[pos:]
+
+
+def write_passwords(file, count, length=12, classes=("upper", "lower", "digits"), chunk_size=10000):
+    """Stream `count` newline-separated passwords to a text file object.
+
+    Returns a summary dict with count, seconds, rate (passwords/sec) and
+    entropy_bits per password.
+    """
+    start = time.perf_counter()
+    passwords = generate_passwords(count, length, classes)
+    while True:
+        chunk = list(itertools.islice(passwords, chunk_size))
+        if not chunk:
+            break
+        file.write("\n".join(chunk))
+        file.write("\n")
+    seconds = time.perf_counter() - start
+    return {
+        "count": count,
+        "seconds": seconds,
+        "rate": count / seconds if seconds > 0 else float("inf"),
+        "entropy_bits": password_entropy_bits(length, classes),
+    }
@@ -0,0 +1,252 @@
+"""QR code rendering, caching and batch generation."""
+import csv
+import io
+import itertools
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from toolbox_core import _cell, _import_heavy
+
+
+# ---------------------- QR CODES ---------------------- #
+QR_ERROR_LEVELS = ("L", "M", "Q", "H")
+
+
+def render_qr_matrix(data, error_correction="M", version=None, border=4):
+    """Encode `data` and return (size, modules).
+
+    `modules` holds one byte per module including the quiet-zone border, 0 for
+    dark and 255 for light, which is exactly the pixel data of an "L" image.
+    `version` None picks the smallest version that fits.
+    """
+    qrcode = _import_heavy("qrcode")
+    levels = {
+        "L": qrcode.constants.ERROR_CORRECT_L,
+        "M": qrcode.constants.ERROR_CORRECT_M,
+        "Q": qrcode.constants.ERROR_CORRECT_Q,
+        "H": qrcode.constants.ERROR_CORRECT_H,
+    }
+    qr = qrcode.QRCode(version=version, error_correction=levels[error_correction], border=border)
+    qr.add_data(data)
+    qr.make(fit=version is None)
+    matrix = qr.get_matrix()
+    return len(matrix), bytes(0 if dark else 255 for row in matrix for dark in row)
+
+
+def qr_matrix_image(matrix, scale=1):
+    """Build a PIL image of a rendered matrix, `scale` pixels per module."""
+    Image = _import_heavy("PIL.Image")
+    size, modules = matrix
+    image = Image.frombytes("L", (size, size), modules)
+    if scale > 1:
+        image = image.resize((size * scale, size * scale), Image.NEAREST)
+    return image
+
+
+def qr_matrix_svg(matrix, box_size=10):
+    """Render a matrix as a standalone SVG document, one path for all dark modules."""
+    size, modules = matrix
+    runs = []
+    for y in range(size):
+        row = modules[y * size:(y + 1) * size]
+        x = row.find(0)
+        while x != -1:
+            end = row.find(255, x)
+            end = size if end == -1 else end
+            runs.append(f"M{x} {y}h{end - x}v1h{x - end}z")
+            x = row.find(0, end)
+    pixels = size * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path fill="#000" d="{"".join(runs)}"/></svg>'
+    )
+
+
+def iter_qr_rows(src_path):
+    """Yield (name, data) pairs from a CSV or plain-text file.
+
+    A CSV whose first row has a `data` column is read by header, with an
+    optional `name` column for the output file names; otherwise the first
+    column (or the whole line of a .txt file) is the data.
+    """
+    with open(src_path, "r", newline="", encoding="utf-8") as file:
+        if src_path.lower().endswith(".csv"):
+            reader = csv.reader(file)
+            first = next(reader, None)
+            if first is None:
+                return
+            columns = [name.strip().lower() for name in first]
+            if "data" in columns:
+                data_col = columns.index("data")
+                name_col = columns.index("name") if "name" in columns else None
+                rows = reader
+            else:
+                data_col, name_col = 0, None
+                rows = itertools.chain([first], reader)
+            for number, row in enumerate(rows, start=1):
+                data = _cell(row, data_col)
+                if data:
+                    yield _cell(row, name_col) or f"qr_{number:06d}", data
+        else:
+            for number, line in enumerate(file, start=1):
+                data = line.rstrip("\r\n")
+                if data:
+                    yield f"qr_{number:06d}", data
+
+
+def _safe_file_name(name):
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip(" .") or "qr"
+
+
+def _render_qr_files(jobs, fmt, error_correction, box_size, border):
+    # Runs in a worker process: returns (file_name, payload or None, error).
+    results = []
+    for name, data in jobs:
+        try:
+            matrix = render_qr_matrix(data, error_correction, None, border)
+            if fmt == "svg":
+                payload = qr_matrix_svg(matrix, box_size).encode("utf-8")
+            else:
+                buffer = io.BytesIO()
+                qr_matrix_image(matrix, box_size).convert("1").save(buffer, "PNG")
+                payload = buffer.getvalue()
+            results.append((f"{_safe_file_name(name)}.{fmt}", payload, None))
+        except Exception as e:
+            results.append((name, None, str(e)))
+    return results
+
+
+def generate_qr_batch(src_path, output_path, fmt="png", error_correction="M", box_size=10, border=4,
+                      workers=None, jobs_per_task=16, progress=None, cancel=None):
+    """Render one QR code per row of `src_path` across a process pool.
+
+    Output goes into a ZIP archive when `output_path` ends with .zip,
+    otherwise into that directory, as each task completes. Repeated names
+    get a -2, -3, ... suffix so no code overwrites another. At most a few tasks
+    per worker are in flight, so memory stays bounded however long the input
+    is. `progress(done, failed)` is called from the calling thread after every
+    task and `cancel` is a threading.Event that stops the run early.
+
+    Returns a summary dict with count, failed, seconds, rate and cancelled.
+    """
+    fmt = fmt.lower()
+    if fmt not in ("png", "svg"):
+        raise ValueError("Format must be 'png' or 'svg'.")
+    workers = workers or os.cpu_count() or 1
+    to_zip = output_path.lower().endswith(".zip")
+    if to_zip:
+        archive = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED if fmt == "svg" else zipfile.ZIP_STORED)
+    else:
+        os.makedirs(output_path, exist_ok=True)
+    done = failed = 0
+    used_names = set()  # lower-cased, as Windows file names are case-insensitive
+    start = time.perf_counter()
+
+    def unique(file_name):
+        stem, ext = os.path.splitext(file_name)
+        candidate, number = file_name, 1
+        while candidate.lower() in used_names:
+            number += 1
+            candidate = f"{stem}-{number}{ext}"
+        used_names.add(candidate.lower())
+        return candidate
+
+    def write(results):
+        nonlocal done, failed
+        for file_name, payload, error in results:
+            if payload is None:
+                failed += 1
+                done += 1
+                continue
+            file_name = unique(file_name)
+            if to_zip:
+                archive.writestr(file_name, payload)
+            else:
+                with open(os.path.join(output_path, file_name), "wb") as file:
+                    file.write(payload)
+            done += 1
+        if progress is not None:
+            progress(done, failed)
+
+    rows = iter_qr_rows(src_path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            while not (cancel is not None and cancel.is_set()):
+                jobs = list(itertools.islice(rows, jobs_per_task))
+                if not jobs:
+                    break
+                pending.add(pool.submit(_render_qr_files, jobs, fmt, error_correction, box_size, border))
+                if len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write(future.result())
+            while pending and not (cancel is not None and cancel.is_set()):
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(future.result())
+            for future in pending:
+                future.cancel()
+    finally:
+        if to_zip:
+            archive.close()
+    seconds = time.perf_counter() - start
+    return {
+        "count": done - failed,
+        "failed": failed,
+        "seconds": seconds,
+        "rate": (done - failed) / seconds if seconds > 0 else float("inf"),
+        "cancelled": cancel is not None and cancel.is_set(),
+    }
+
+
+class QRMatrixCache:
+    """Thread-safe LRU cache of rendered QR matrices, bounded by total bytes.
+
+    Keys are (data, error_correction, version, border); the box size only
+    scales the image at display/save time, so it is not part of the key.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, data, error_correction="M", version=None, border=4):
+        key = (data, error_correction, version, border)
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+            return matrix
+
+    def get(self, data, error_correction="M", version=None, border=4):
+        matrix = self.peek(data, error_correction, version, border)
+        if matrix is not None:
+            return matrix
+        matrix = render_qr_matrix(data, error_correction, version, border)
+        self.put(matrix, data, error_correction, version, border)
+        return matrix
+
+    def put(self, matrix, data, error_correction="M", version=None, border=4):
+        """Store a matrix rendered elsewhere, e.g. in a worker process."""
+        key = (data, error_correction, version, border)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = matrix
+                self.size_bytes += self._entry_bytes(key, matrix)
+                while self.size_bytes > self.max_bytes and len(self._entries) > 1:
+                    old_key, old_matrix = self._entries.popitem(last=False)
+                    self.size_bytes -= self._entry_bytes(old_key, old_matrix)
+
+    @staticmethod
+    def _entry_bytes(key, matrix):
+        return len(matrix[1]) + len(key[0])
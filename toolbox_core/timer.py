@@ -0,0 +1,156 @@
+"""Countdown timers and stopwatch laps."""
+import heapq
+import csv
+import itertools
+import math
+import time
+from array import array
+
+
+# ---------------------- TIMER ENGINE ---------------------- #
+def format_hms(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+class CountdownTimer:
+    __slots__ = ("name", "duration", "deadline", "remaining", "state", "seq")
+
+    def __init__(self, name, duration):
+        self.name = name
+        self.duration = duration
+        self.deadline = None  # absolute clock() time while running
+        self.remaining = duration  # seconds left while paused
+        self.state = "paused"
+        self.seq = None
+
+
+class TimerEngine:
+    """Named countdown timers driven by absolute monotonic deadlines.
+
+    Running timers sit in a heap keyed by deadline, so the host only needs one
+    wakeup for the nearest deadline however many timers exist, and lateness
+    of a wakeup never accumulates. Heap entries of paused or removed timers
+    are left in place and skipped when they reach the top.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.timers = {}
+        self._heap = []
+        self._seq = itertools.count()
+
+    def start(self, name, seconds):
+        """Start (or restart) `name` counting down from `seconds`."""
+        if seconds <= 0:
+            raise ValueError("Timer duration must be positive.")
+        self.timers[name] = CountdownTimer(name, seconds)
+        self.resume(name)
+
+    def pause(self, name):
+        timer = self.timers[name]
+        if timer.state == "running":
+            timer.remaining = max(0.0, timer.deadline - self.clock())
+            timer.deadline = None
+            timer.state = "paused"
+
+    def resume(self, name):
+        timer = self.timers[name]
+        if timer.state == "paused":
+            timer.deadline = self.clock() + timer.remaining
+            timer.state = "running"
+            timer.seq = next(self._seq)
+            heapq.heappush(self._heap, (timer.deadline, timer.seq, name))
+
+    def remove(self, name):
+        self.timers.pop(name, None)
+
+    def remaining(self, name):
+        timer = self.timers[name]
+        if timer.state == "running":
+            return max(0.0, timer.deadline - self.clock())
+        return timer.remaining
+
+    def _is_live(self, entry):
+        timer = self.timers.get(entry[2])
+        return timer is not None and timer.state == "running" and timer.seq == entry[1]
+
+    def next_deadline(self):
+        """Clock time of the nearest running deadline, or None."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_expired(self):
+        """Mark every timer whose deadline has passed as done and return their names."""
+        now = self.clock()
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                timer = self.timers[entry[2]]
+                timer.state = "done"
+                timer.remaining = 0.0
+                expired.append(entry[2])
+        return expired
+
+
+# ---------------------- STOPWATCH LAPS ---------------------- #
+def format_elapsed(seconds, decimals=2):
+    """Format seconds as HH:MM:SS with `decimals` fractional digits."""
+    mins, secs = divmod(seconds, 60)
+    hours, mins = divmod(mins, 60)
+    width = 2 + (decimals + 1 if decimals else 0)
+    return f"{int(hours):02d}:{int(mins):02d}:{secs:0{width}.{decimals}f}"
+
+
+class LapStore:
+    """Lap splits and durations in compact double arrays with O(1) running stats.
+
+    Mean and standard deviation are updated with Welford's algorithm, so
+    recording a lap never rescans earlier ones.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.splits = array("d")
+        self.laps = array("d")
+        self.best = self.worst = None  # lap indexes
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self):
+        return len(self.laps)
+
+    def record(self, split):
+        lap = split - (self.splits[-1] if self.splits else 0.0)
+        self.splits.append(split)
+        self.laps.append(lap)
+        index = len(self.laps) - 1
+        if self.best is None or lap < self.laps[self.best]:
+            self.best = index
+        if self.worst is None or lap > self.laps[self.worst]:
+            self.worst = index
+        delta = lap - self._mean
+        self._mean += delta / len(self.laps)
+        self._m2 += delta * (lap - self._mean)
+        return lap
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def stddev(self):
+        return math.sqrt(self._m2 / (len(self.laps) - 1)) if len(self.laps) > 1 else 0.0
+
+    def write_csv(self, file, decimals=3):
+        """Stream every lap to a text file object as CSV."""
+        writer = csv.writer(file)
+        writer.writerow(["lap", "lap_seconds", "split_seconds", "lap_time", "split_time"])
+        for number, (lap, split) in enumerate(zip(self.laps, self.splits), start=1):
+            writer.writerow([number, f"{lap:.6f}", f"{split:.6f}", format_elapsed(lap, decimals), format_elapsed(split, decimals)])